@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# Compares the per-tick cost of the pytz path with the offset-table engine.
+import pathlib
+import sys
+import time
+from datetime import datetime
+
+here = pathlib.Path(__file__).parent.resolve()
+sys.path.insert(0, str(here.parent / "src"))
+
+import pytz
+from multiple_desktop_clocks.modules.tzengine import TimezoneEngine
+
+
+def pytz_tick(zones):
+    for name in zones:
+        tz = pytz.timezone(name)
+        now = datetime.now(tz)
+        now.strftime("%H:%M:%S")
+
+def engine_tick(zones):
+    for zone in zones:
+        h, m, s = zone.hms()
+        "%02d:%02d:%02d" % (h, m, s)
+
+def measure(func, arg, ticks):
+    func(arg)  # warm-up
+    start = time.perf_counter()
+    for _ in range(ticks):
+        func(arg)
+    return (time.perf_counter() - start) / ticks
+
+def main(ticks=2000):
+    names = list(pytz.common_timezones)
+    print(f"{'clocks':>7} {'pytz us/tick':>14} {'engine us/tick':>15} {'speedup':>8}")
+    for n in (1, 50, 500):
+        zone_names = [names[i % len(names)] for i in range(n)]
+        engine = TimezoneEngine()
+        zones = [engine.zone(name) for name in zone_names]
+        t_pytz = measure(pytz_tick, zone_names, ticks)
+        t_engine = measure(engine_tick, zones, ticks)
+        print(f"{n:>7} {t_pytz * 1e6:>14.1f} {t_engine * 1e6:>15.1f} {t_pytz / t_engine:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
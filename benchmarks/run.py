@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# Headless benchmarks of the clock hot paths.
+#
+#   python3 benchmarks/run.py                      # run and compare with baseline.json
+#   python3 benchmarks/run.py --save-baseline      # store the results as the new baseline
+#   python3 benchmarks/run.py --output results.json
+#
+# A calibration loop is timed in the same run and stored with the baseline: the
+# baseline is scaled by how much faster or slower this machine is right now, so
+# a baseline recorded elsewhere still compares. Re-record it with --save-baseline
+# after a change that is meant to be slower, and commit baseline.json.
+import argparse
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import time
+
+here = pathlib.Path(__file__).parent.resolve()
+sys.path.insert(0, str(here.parent / "src"))
+
+# Before any Qt or package import: no display and no writes to the real config
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+os.environ["HOME"] = tempfile.mkdtemp(prefix="mdc-bench-")
+
+BASELINE_PATH = here / "baseline.json"
+
+
+def best_of(func, repeat=9, number=1):
+    """Best time per call in milliseconds over `repeat` rounds of `number` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best * 1000.0
+
+
+def calibrate():
+    """Milliseconds of a fixed pure-Python loop: the speed of this machine right now."""
+    def loop():
+        total = 0
+        for i in range(100000):
+            total += i * i % 7
+        return total
+    return best_of(loop, repeat=15)
+
+
+def bench_update_time(results, tray, zones):
+    tray.add_clocks([(tz, 0, 0) for tz in zones[:50]], save=False)
+    clocks = list(tray.clocks.values())
+
+    def tick():
+        for clock in clocks:
+            clock.update_time()
+
+    results["update_time/50_clocks"] = best_of(tick, number=20)
+    tray.close_clocks()
+
+
+def bench_rounded_corners(results, tray):
+    from multiple_desktop_clocks.modules.geometry import rounded_mask
+    tray.add_clock("UTC", 0, 0)
+    clock = tray.clocks["UTC"]
+    results["set_rounded_corners/cached"] = best_of(lambda: clock.set_rounded_corners(clock.theme.radius), number=200)
+    results["set_rounded_corners/uncached"] = best_of(
+        lambda: rounded_mask.__wrapped__(clock.width(), clock.height(), clock.theme.radius), number=200)
+    tray.close_clocks()
+
+
+def bench_add_clock(results, tray, zones):
+    for n in (1, 10, 100, 500):
+        entries = [(tz, 0, 0) for tz in zones[:n]]
+
+        def add():
+            tray.add_clocks(entries)
+            tray.close_clocks()
+
+        results[f"add_clocks/{n}"] = best_of(add, repeat=3)
+
+
+def bench_config(results, zones):
+    from multiple_desktop_clocks.modules.configure import load_config, save_config
+    path = os.path.join(os.environ["HOME"], "bench", "config.json")
+    for n in (100, 1000, 10000):
+        clocks = {f"{zones[i % len(zones)]}#{i}": {"x": i, "y": i} for i in range(n)}
+        results[f"save_config/{n}"] = best_of(lambda: save_config(path, clocks))
+        results[f"load_config/{n}"] = best_of(lambda: load_config(path))
+
+
+def bench_tzengine(results, zones):
+    import bench_tzengine
+    from multiple_desktop_clocks.modules.tzengine import TimezoneEngine
+    engine = TimezoneEngine()
+    names = zones[:500]
+    engine_zones = [engine.zone(name) for name in names]
+    results["tzengine/500_clocks"] = best_of(lambda: bench_tzengine.engine_tick(engine_zones), number=20)
+    results["pytz/500_clocks"] = best_of(lambda: bench_tzengine.pytz_tick(names), number=5)
+
+
+STARTUP_SCRIPT = """
+import sys
+sys.path.insert(0, sys.argv[1])
+from multiple_desktop_clocks.modules import tzbackend
+backend = tzbackend.PytzBackend() if sys.argv[2] == "pytz" else tzbackend.ZoneinfoBackend(sys.argv[3])
+for name in sys.argv[4:]:
+    if backend.is_valid(name):
+        backend.transitions(name)
+"""
+
+def bench_tz_backends(results, zones):
+    # Startup: a fresh interpreter that imports the backend, checks and loads 50 zones,
+    # minus the interpreter itself
+    from multiple_desktop_clocks.modules.tzbackend import ZoneinfoBackend, find_zoneinfo_root
+    root = find_zoneinfo_root()
+    names = zones[:50]
+
+    def startup(kind):
+        command = [sys.executable, "-c", STARTUP_SCRIPT, str(here.parent / "src"), kind, root or ""] + names
+        return best_of(lambda: subprocess.run(command, check=True), repeat=5)
+
+    interpreter = best_of(lambda: subprocess.run([sys.executable, "-c", "pass"], check=True), repeat=5)
+    results["tz_startup/pytz"] = max(startup("pytz") - interpreter, 0.0)
+    if root:
+        results["tz_startup/zoneinfo"] = max(startup("zoneinfo") - interpreter, 0.0)
+        # What a tzdata update costs: the files are read and parsed again
+        backend = ZoneinfoBackend(root)
+        results["tz_reload/zoneinfo_50"] = best_of(lambda: [backend.transitions(name) for name in names], repeat=5)
+
+
+def run():
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtGui import QIcon
+    import pytz
+    from multiple_desktop_clocks.indicator import ClockIndicator
+
+    app = QApplication(sys.argv[:1])
+    tray = ClockIndicator(QIcon())
+    zones = list(pytz.all_timezones)
+
+    results = {}
+    calibration = calibrate()
+    bench_update_time(results, tray, zones)
+    bench_rounded_corners(results, tray)
+    bench_add_clock(results, tray, zones)
+    bench_config(results, zones)
+    bench_tzengine(results, zones)
+    bench_tz_backends(results, zones)
+
+    tray.writer.flush()
+    app.quit()
+    # Before and after: the faster of the two is the least disturbed by other load
+    return results, min(calibration, calibrate())
+
+
+def compare(results, baseline, tolerance, min_delta, scale=1.0):
+    regressions = []
+    for name, value in sorted(results.items()):
+        base = baseline.get(name)
+        if base is not None:
+            base *= scale   # in the speed of this machine right now
+        if base is None:
+            status = "new"
+        elif value > base * (1.0 + tolerance) and value - base > min_delta:
+            status = "SLOWER"
+            regressions.append(name)
+        else:
+            status = "ok"
+        base_str = f"{base:10.3f}" if base is not None else " " * 10
+        print(f"{name:32} {value:10.3f} ms  baseline {base_str} ms  {status}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks of the clock hot paths")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed slowdown relative to the baseline (0.5 = 50%%)")
+    parser.add_argument("--min-delta", type=float, default=0.02,
+                        help="slowdowns below this many milliseconds are never reported")
+    args = parser.parse_args()
+
+    results, calibration = run()
+    document = {"python": sys.version.split()[0], "calibration": calibration, "results": results}
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=4)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(document, f, indent=4)
+        print(f"Baseline saved in {args.baseline}")
+        return 0
+
+    baseline, scale = {}, 1.0
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            saved = json.load(f)
+        baseline = saved.get("results", {})
+        if saved.get("calibration"):
+            scale = calibration / saved["calibration"]
+    print(f"calibration {calibration:.3f} ms: baseline scaled by {scale:.2f}")
+    regressions = compare(results, baseline, args.tolerance, args.min_delta, scale)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than the baseline: " + ", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
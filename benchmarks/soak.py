@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# Soak run of the tick path on a simulated clock: CPU and memory per simulated day.
+#
+#   python3 benchmarks/soak.py                          # 500 clocks, one year, hourly ticks
+#   python3 benchmarks/soak.py --days 30 --step 60      # a month of minute ticks
+#   python3 benchmarks/soak.py --engine-only --step 1   # offset tables and templates, no Qt
+#   python3 benchmarks/soak.py --verify                 # also compare every clock with pytz or zoneinfo daily
+#   python3 benchmarks/soak.py --backend pytz           # zone data from pytz instead of the system tzdata
+import argparse
+import json
+import os
+import pathlib
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+here = pathlib.Path(__file__).parent.resolve()
+sys.path.insert(0, str(here.parent / "src"))
+
+# Before any Qt or package import: no display and no writes to the real config
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+os.environ["HOME"] = tempfile.mkdtemp(prefix="mdc-soak-")
+
+import pytz
+from multiple_desktop_clocks.modules.timesource import SimulatedTimeSource, set_time_source
+from multiple_desktop_clocks.modules.tzbackend import backend_from_settings
+from multiple_desktop_clocks.modules.tzengine import get_engine
+
+FORMAT = "%Y-%m-%d %H:%M"
+
+
+def rss_kib():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize() // 1024
+
+
+class EngineClocks:
+    """The tick path without Qt: offset tables plus compiled templates."""
+
+    def __init__(self, zones, backend):
+        from multiple_desktop_clocks.modules.formats import compile_format
+        engine = get_engine()
+        self.clocks = [(name, engine.zone(name), compile_format(FORMAT, "")) for name in zones]
+
+    def tick(self):
+        for name, zone, template in self.clocks:
+            template.render(zone.local_seconds(), zone.offset, zone.abbr)
+
+    def texts(self):
+        return {name: template.render(zone.local_seconds(), zone.offset, zone.abbr)
+                for name, zone, template in self.clocks}
+
+    def idle(self):
+        pass
+
+
+class WidgetClocks:
+    """The real tick path: ClockIndicator, TickScheduler and the clock windows, offscreen."""
+
+    def __init__(self, zones, backend):
+        from PyQt5.QtWidgets import QApplication
+        from PyQt5.QtGui import QIcon
+        from multiple_desktop_clocks.indicator import ClockIndicator
+        self.app = QApplication(sys.argv[:1])
+        self.tray = ClockIndicator(QIcon())
+        get_engine().set_backend(backend)   # the indicator took the one of its (empty) settings
+        self.tray.add_clocks([(name, 0, 0, {"format": FORMAT, "label": " "}) for name in zones], save=False)
+        self.app.processEvents()   # shown and exposed, so the scheduler ticks them
+
+    def tick(self):
+        self.tray.scheduler.tick(on_time=False)
+
+    def texts(self):
+        return {name: clock.template.render(clock.zone.local_seconds(), clock.zone.offset, clock.zone.abbr)
+                for name, clock in self.tray.clocks.items()}
+
+    def idle(self):
+        # Let Qt paint what the ticks of the day changed
+        self.app.processEvents()
+
+
+def reference_zone(name):
+    # The same data as the engine: the system tzdata read by the zoneinfo module, or pytz
+    if get_engine().backend.name == "zoneinfo":
+        import zoneinfo
+        return zoneinfo.ZoneInfo(name)
+    return pytz.timezone(name)
+
+
+def verify(clocks, now):
+    errors = 0
+    for name, text in clocks.texts().items():
+        expected = datetime.fromtimestamp(int(now), timezone.utc).astimezone(reference_zone(name)).strftime(FORMAT)
+        if text != expected:
+            errors += 1
+            if errors <= 5:
+                print(f"  {name}: shows {text!r}, {get_engine().backend.name} says {expected!r}")
+    return errors
+
+
+def run(args):
+    names = list(pytz.common_timezones)
+    zones = [names[i % len(names)] for i in range(args.clocks)]
+    start = datetime(args.year, 1, 1, tzinfo=pytz.utc).timestamp()
+    source = SimulatedTimeSource(start, speed=0)   # only moves through advance()
+    set_time_source(source)
+
+    backend = backend_from_settings({"tz_backend": args.backend})
+    get_engine().set_backend(backend)
+    clocks = EngineClocks(zones, backend) if args.engine_only else WidgetClocks(zones, backend)
+    steps_per_day = 86400 // args.step
+    rss_start = rss_kib()
+    cpu_per_day = []
+    errors = 0
+
+    wall = time.perf_counter()
+    for day in range(args.days):
+        cpu = time.process_time()
+        for _ in range(steps_per_day):
+            source.advance(args.step)
+            clocks.tick()
+        clocks.idle()
+        cpu_per_day.append((time.process_time() - cpu) * 1000.0)
+        if args.verify:
+            errors += verify(clocks, source.now())
+    wall = time.perf_counter() - wall
+    rss_end = rss_kib()
+
+    cpu_sorted = sorted(cpu_per_day)
+    return {
+        "clocks": args.clocks,
+        "days": args.days,
+        "step_s": args.step,
+        "path": "engine" if args.engine_only else "widgets",
+        "tz_backend": get_engine().backend.name,
+        "updates": args.clocks * steps_per_day * args.days,
+        "wall_s": round(wall, 2),
+        "cpu_ms_per_day": {
+            "mean": round(sum(cpu_per_day) / len(cpu_per_day), 3),
+            "p50": round(cpu_sorted[len(cpu_sorted) // 2], 3),
+            "max": round(cpu_sorted[-1], 3),
+        },
+        "rss_kib": {"start": rss_start, "end": rss_end,
+                    "growth_per_day": round((rss_end - rss_start) / args.days, 2)},
+        "verify_errors": errors if args.verify else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak run of the clocks on a simulated time source")
+    parser.add_argument("--clocks", type=int, default=500)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--step", type=int, default=3600, help="simulated seconds per tick (divides 86400)")
+    parser.add_argument("--year", type=int, default=datetime.now().year)
+    parser.add_argument("--engine-only", action="store_true", help="skip Qt: offset tables and templates only")
+    parser.add_argument("--verify", action="store_true", help="compare every clock with pytz (or zoneinfo for the system tzdata) once a day")
+    parser.add_argument("--backend", default="auto", choices=("auto", "zoneinfo", "pytz"),
+                        help="where the zone data comes from")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+    if 86400 % args.step:
+        parser.error("--step must divide 86400")
+
+    result = run(args)
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    return 1 if result["verify_errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,772 @@
+import os, sys, time
+from contextlib import contextmanager
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtWidgets import (QApplication, QWidget, QSystemTrayIcon,
+                             QMenu, QInputDialog, QMessageBox)
+
+import multiple_desktop_clocks.about as about
+from multiple_desktop_clocks.modules.configure import CONFIG_PATH, clock_options, load_config, load_settings
+from multiple_desktop_clocks.modules.persistence import ConfigWriter
+from multiple_desktop_clocks.modules.scheduler import TickScheduler
+from multiple_desktop_clocks.modules.tzengine  import get_engine
+from multiple_desktop_clocks.modules.tzbackend import backend_from_settings
+from multiple_desktop_clocks.modules.timesource import get_time_source, set_time_source, time_source_from_settings
+from multiple_desktop_clocks.modules.clockface import ClockFace
+from multiple_desktop_clocks.modules.analog    import AnalogFace, dial_label
+from multiple_desktop_clocks.modules.geometry  import rounded_mask
+from multiple_desktop_clocks.modules.metrics   import get_metrics
+from multiple_desktop_clocks.modules.session   import ExposeTracker, SessionMonitor
+from multiple_desktop_clocks.modules.formats   import PRESETS, compile_clock_format
+from multiple_desktop_clocks.modules.themes    import THEME_KEYS, get_theme_registry
+from multiple_desktop_clocks.modules.layout    import (resolve_position, screen_list, screen_position,
+                                                       shelf_pack)
+
+
+# ======== Classe da janela do relógio ========
+
+class StickyClock(QWidget):
+    def __init__(self, timezone, options=None):
+        super().__init__()
+        self.timezone = timezone
+        self.zone = get_engine().zone(timezone)
+        self.options = clock_options(options or {})  # "format", "label" and theme keys of config.json
+        self.theme = get_theme_registry().resolve(self.options)
+        self.template = compile_clock_format(self.options, timezone)
+        
+        self.setWindowFlags(
+            Qt.FramelessWindowHint |
+            Qt.Tool
+        )
+        
+        self.setAttribute(Qt.WA_TranslucentBackground)
+
+        self.resize(250, self.theme.height)
+        self.move(200, 200)
+
+        # "style": "analog" draws hands over a cached dial instead of the text
+        self.analog = self.options.get("style") == "analog"
+        if self.analog:
+            self.face = AnalogFace(self.theme, self)
+        else:
+            self.face = ClockFace(self.theme.font, self.theme.color, self)
+            self.face.background = self.theme.background
+        self.face.timezone = timezone
+        self.metrics = get_metrics()
+        self.face.setGeometry(0, 0, 250, self.theme.height)
+
+        # Ticks are driven by the TickScheduler of the tray, only while visible
+        self.tick_resolution = self.template.resolution
+        # %f clocks are repainted on every frame by the FrameDriver of the scheduler
+        self.subsecond = self.template.subsecond and not self.analog
+        self.shown_second = None   # UTC second of the last update
+        self.expose_tracker = ExposeTracker(self, self.on_exposed_changed)
+        self.update_time()
+
+        # Dragging: a system move when possible, else moves coalesced to the frame rate
+        self.old_pos = None
+        self.drag_start = None
+        self.drag_target = None
+        self.snap = None
+        self.system_moving = False
+        self.drag_timer = QTimer(self)
+        self.drag_timer.setSingleShot(True)
+        self.drag_timer.timeout.connect(self.apply_drag)
+
+        self.set_rounded_corners(self.theme.radius)
+
+    def is_visible_for_ticks(self):
+        return self.expose_tracker.exposed
+
+    def on_exposed_changed(self, exposed):
+        if hasattr(self, "tray_ref"):
+            self.tray_ref.scheduler.visibility_changed(self)
+
+    def set_rounded_corners(self, radius):
+        self.setMask(rounded_mask(self.width(), self.height(), radius))
+
+    def set_theme(self, theme):
+        self.theme = theme
+        if self.analog:
+            self.face.set_theme(theme)
+        else:
+            self.face.set_style(theme.font, theme.color, theme.background)
+        self.fit_text(force=True)
+
+    def set_format(self, spec, label=None):
+        for key, value in (("format", spec), ("label", label)):
+            if value:
+                self.options[key] = value
+            else:
+                self.options.pop(key, None)
+        self.template = compile_clock_format(self.options, self.timezone)
+        self.tick_resolution = self.template.resolution
+        self.subsecond = self.template.subsecond and not self.analog
+        self.update_time()
+
+    def update_time(self):
+        t0 = time.perf_counter()
+        now = get_time_source().now()
+        zone = self.zone
+        local = zone.local_seconds(now)
+        self.shown_second = int(now)
+        if self.analog:
+            self.face.set_time(local, dial_label(self.options, self.timezone), self.template.has_seconds)
+        else:
+            self.face.set_text(self.template.render(local, zone.offset, zone.abbr, now % 1.0), self.template.tail)
+        t1 = time.perf_counter()
+        self.metrics.record("format", t1 - t0)
+
+        self.fit_text(t1)
+
+    def fit_text(self, t1=None, force=False):
+        # The width only changes with the label or the length of the text
+        t1 = t1 or time.perf_counter()
+        if self.analog:
+            text_width = height = self.face.side()
+            radius = height // 2   # round window
+        else:
+            text_width = self.face.text_width() + 20
+            height, radius = self.theme.height, self.theme.radius
+        if force or text_width != self.width() or height != self.height():
+            self.resize(text_width, height)
+            self.face.setGeometry(0, 0, text_width, height)
+            t2 = time.perf_counter()
+            self.set_rounded_corners(radius)
+            self.metrics.record("resize", t2 - t1)
+            self.metrics.record("mask", time.perf_counter() - t2)
+
+    # Mover a janela com o mouse
+    def mousePressEvent(self, event):
+        if event.button() != Qt.LeftButton:
+            return
+        self.system_moving = False
+        self.snap = self.tray_ref.snap_index(self) if hasattr(self, "tray_ref") else None
+        # The window manager cannot snap, so snapping keeps the drag in Qt
+        if self.snap is None and self.start_system_move():
+            return
+        self.old_pos = event.globalPos()
+        self.drag_start = self.pos()
+
+    def start_system_move(self):
+        handle = self.windowHandle()
+        if handle is None or not hasattr(handle, "startSystemMove"):  # Qt < 5.15
+            return False
+        self.system_moving = handle.startSystemMove()
+        return self.system_moving
+
+    def moveEvent(self, event):
+        super().moveEvent(event)
+        # The release of a system move goes to the window manager, not to us
+        if self.system_moving and hasattr(self, "tray_ref"):
+            self.tray_ref.save_all_positions()
+
+    def enterEvent(self, event):
+        super().enterEvent(event)
+        # The pointer comes back to the window when the window manager ends the move
+        self.end_system_move()
+
+    def end_system_move(self):
+        # Later moves are programmatic and saved (or not) by whoever makes them
+        if self.system_moving:
+            self.system_moving = False
+            if hasattr(self, "tray_ref"):
+                self.tray_ref.save_all_positions()
+
+    def mouseMoveEvent(self, event):
+        if self.old_pos is not None:
+            self.drag_target = self.drag_start + (event.globalPos() - self.old_pos)
+            if not self.drag_timer.isActive():
+                self.drag_timer.start(self.frame_interval())
+
+    def frame_interval(self):
+        screen = self.screen()
+        rate = screen.refreshRate() if screen is not None else 0
+        return int(1000 / rate) if rate > 0 else 16
+
+    def apply_drag(self):
+        if self.drag_target is None:
+            return
+        pos = self.drag_target
+        if self.snap is not None:
+            pos = self.snap.snap(pos, self.size())
+        if pos != self.pos():
+            self.move(pos)
+
+    def mouseReleaseEvent(self, event):
+        if self.old_pos is None:
+            self.end_system_move()
+            return
+        self.drag_timer.stop()
+        self.apply_drag()
+        self.old_pos = self.drag_start = self.drag_target = self.snap = None
+        if hasattr(self, "tray_ref"):   # se o relógio conhece o tray
+            self.tray_ref.save_all_positions()
+
+# ======== Tray com múltiplos relógios ========
+
+class ClockIndicator(QSystemTrayIcon):
+    clocksChanged = pyqtSignal()   # a clock was added or removed
+
+    def __init__(self, icon, parent=None):
+        super().__init__(icon, parent)
+        self.base_icon = icon
+
+        self.clocks = {}  # timezone -> StickyClock, ClockItem or TrayEntry
+        self.scheduler = TickScheduler(self)
+        self.session = SessionMonitor(self)
+        self.session.idle_changed.connect(self.scheduler.set_session_idle)
+        self.writer = ConfigWriter(CONFIG_PATH, parent=self)
+
+        # "window": one window per clock, "board": all clocks in one window,
+        # "tray": no window, the clocks are drawn in the tray icon and menu
+        self.settings = load_settings(CONFIG_PATH)
+        self.scheduler.frames.budget = float(self.settings.get("frame_budget", 0.5))
+        self.mode = self.settings.get("mode", "window")
+        self.board = None
+        self.tray_display = None
+        self.control = None
+        self.planner = None
+        self.themes = get_theme_registry()
+        self.themes.load(self.settings)
+        if "time_source" in self.settings:
+            set_time_source(time_source_from_settings(self.settings))
+        get_metrics().sources["time_source"] = lambda: get_time_source().describe()
+        # Zone data: the system tzdata by default, or pytz with "tz_backend": "pytz"
+        get_engine().set_backend(backend_from_settings(self.settings))
+        get_metrics().sources["tz_backend"] = lambda: f"{get_engine().backend.name} {get_engine().backend.version()}"
+
+        # Carregar fusos do JSON
+        self.config = load_config(CONFIG_PATH)
+        backend = get_engine().backend
+        for timezone in [tz for tz in self.config if not backend.is_valid(tz)]:
+            # e.g. US/Eastern when the system tzdata ships legacy names in another package
+            print(f"Unknown time zone: {timezone}", file=sys.stderr)
+            del self.config[timezone]
+        self.add_clocks([(tz, pos.get("x", 200), pos.get("y", 200), pos)
+                         for tz, pos in self.config.items()], save=False)
+
+        self.watch_screens()
+
+        # Changes made to config.json by other programs are applied live
+        from multiple_desktop_clocks.modules.configwatch import ConfigWatcher
+        self.watcher = ConfigWatcher(CONFIG_PATH, self.writer, parent=self)
+        self.watcher.changed.connect(self.apply_config)
+
+        # A tzdata update (e.g. a new DST rule) is applied without a restart
+        from multiple_desktop_clocks.modules.tzwatch import TzdataWatcher
+        self.tzwatch = TzdataWatcher(get_engine(), parent=self)
+        self.tzwatch.zonesChanged.connect(self.zones_changed)
+        self.clocksChanged.connect(lambda: self.tzwatch.watch(self.clocks))
+        self.tzwatch.watch(self.clocks)
+
+
+        menu = QMenu(parent)
+        
+        # Add
+        add_action = menu.addAction("➕ Add time zone")
+        add_action.triggered.connect(self.add_timezone)
+        
+        # Remove
+        remove_action = menu.addAction("➖ Remove time zone")
+        remove_action.triggered.connect(self.remove_timezone)
+        
+        # Format
+        format_action = menu.addAction("🕒 Clock format")
+        format_action.triggered.connect(self.change_format)
+        
+        # Auto-arrange
+        arrange_action = menu.addAction("🧩 Auto-arrange")
+        arrange_action.triggered.connect(self.auto_arrange)
+        
+        # Snapping
+        snap_action = menu.addAction("🧲 Snap to edges")
+        snap_action.setCheckable(True)
+        snap_action.setChecked(bool(self.settings.get("snap", False)))
+        snap_action.toggled.connect(self.set_snap)
+        
+        # Theme
+        self.theme_menu = menu.addMenu("🎨 Theme")
+        self.theme_menu.aboutToShow.connect(self.fill_theme_menu)
+        
+        #
+        menu.addSeparator()
+        
+        # Board mode
+        self.board_action = menu.addAction("🗔 Board mode")
+        self.board_action.setCheckable(True)
+        self.board_action.setChecked(self.mode == "board")
+        self.board_action.toggled.connect(lambda checked: self.set_mode("board" if checked else "window"))
+        
+        # Tray-only mode
+        self.tray_action = menu.addAction("🔔 Tray only")
+        self.tray_action.setCheckable(True)
+        self.tray_action.setChecked(self.mode == "tray")
+        self.tray_action.toggled.connect(lambda checked: self.set_mode("tray" if checked else "window"))
+        
+        #
+        menu.addSeparator()
+        
+        # Planner
+        planner_action = menu.addAction("📅 Meeting planner")
+        planner_action.triggered.connect(self.show_planner)
+        
+        # Statistics
+        stats_action = menu.addAction("📊 Statistics")
+        stats_action.triggered.connect(self.show_stats)
+        
+        # About
+        about_action = menu.addAction("ℹ️ About")
+        about_action.triggered.connect(self.show_about)
+        
+        # Exit
+        exit_action = menu.addAction("❌ Exit")
+        exit_action.triggered.connect(self.exit_app)
+        
+        self.setContextMenu(menu)
+
+        self.show()
+
+        # The search index of the time zone picker is built once, while idle,
+        # with the current abbreviations and offsets of every zone
+        QTimer.singleShot(5000, self.prepare_timezone_index)
+
+    def add_clock(self, timezone, x=200, y=200):
+        self.add_clocks([(timezone, x, y)])
+
+    def add_clocks(self, entries, save=True):
+        """Build every window first, then show them in one pass and save at most once.
+
+        entries are (timezone, x, y) or (timezone, x, y, options) tuples.
+        """
+        new_clocks = []
+        screens = screen_list(QApplication.instance())
+        for timezone, x, y, *options in entries:
+            if timezone in self.clocks:
+                continue
+            entry = options[0] if options else {}
+            clock = self.create_clock(timezone, entry)
+            anchor = (entry["screen"], entry.get("rx", 0), entry.get("ry", 0)) if "screen" in entry else None
+            x, y = resolve_position(anchor, x, y, clock.width(), clock.height(), screens)
+            clock.move(x, y)
+            clock.anchor = anchor or screen_position(x, y, screens)
+            clock.placed = (x, y)
+            clock.tray_ref = self   # <<< adiciona referência ao tray
+            self.clocks[timezone] = clock
+            new_clocks.append(clock)
+
+        for clock in new_clocks:
+            clock.show()
+            self.scheduler.register(clock)
+
+        if new_clocks:
+            self.clocksChanged.emit()
+        if new_clocks and save:
+            self.save_all_positions()
+        return new_clocks
+
+    def create_clock(self, timezone, options=None):
+        if self.mode == "tray":
+            from multiple_desktop_clocks.modules.traymode import TrayDisplay, TrayEntry
+            if self.tray_display is None:
+                self.tray_display = TrayDisplay(self)
+            return TrayEntry(timezone, self.tray_display, options)
+        if self.mode == "board":
+            from multiple_desktop_clocks.modules.board import ClockBoard, ClockItem
+            if self.board is None:
+                self.board = ClockBoard()
+                self.board.scheduler = self.scheduler
+            clock = ClockItem(timezone, self.board, options)
+            self.board.add_item(clock)
+            return clock
+        return StickyClock(timezone, options)
+
+    def close_clocks(self):
+        for clock in self.clocks.values():
+            self.scheduler.unregister(clock)
+            clock.close()
+        self.clocks = {}
+        self.clocksChanged.emit()
+        if self.board is not None:
+            self.board.close()
+            self.board.deleteLater()
+            self.board = None
+        if self.tray_display is not None:
+            self.tray_display.close()
+            self.tray_display.deleteLater()
+            self.tray_display = None
+
+    def set_mode(self, mode):
+        # Recreate every clock in the new mode at the same position
+        if mode == self.mode:
+            return
+        entries = [(tz, data["x"], data["y"], data) for tz, data in self.clock_entries().items()]
+        self.close_clocks()
+        self.mode = mode
+        self.settings["mode"] = mode
+        self.sync_mode_actions()
+        self.add_clocks(entries, save=False)
+        self.save_all_positions()
+
+    def sync_mode_actions(self):
+        for action, mode in ((self.board_action, "board"), (self.tray_action, "tray")):
+            action.blockSignals(True)
+            action.setChecked(self.mode == mode)
+            action.blockSignals(False)
+
+    def set_time_source(self, source):
+        """Switch the clock every clock reads, e.g. to a SimulatedTimeSource."""
+        set_time_source(source)
+        self.scheduler.wake()
+
+    def set_tray_zone(self, timezone):
+        # Zone drawn in the tray icon in the tray mode
+        self.settings["tray_zone"] = timezone
+        if self.tray_display is not None:
+            self.tray_display.changed()
+        self.save_all_positions()
+
+    def zones_changed(self, names):
+        print(f"Time zone data updated: {', '.join(names)}", file=sys.stderr)
+        self.scheduler.wake()
+        if self.planner is not None and self.planner.isVisible():
+            self.planner.refresh()
+
+    def import_zones(self, zones):
+        # New clocks are stacked below the default position
+        backend = get_engine().backend
+        entries = []
+        for timezone in zones:
+            if not backend.is_valid(timezone):
+                print(f"Unknown time zone: {timezone}", file=sys.stderr)
+                continue
+            if timezone not in self.clocks:
+                entries.append((timezone, 200, 200 + 90 * len(entries)))
+        return self.add_clocks(entries)
+
+    def clock_entries(self):
+        data = {}
+        screens = None
+        for tz, clock in self.clocks.items():
+            x, y = int(clock.x()), int(clock.y())
+            # Moved by the user since it was placed: anchor it where it is now
+            if (x, y) != clock.placed:
+                if screens is None:
+                    screens = screen_list(QApplication.instance())
+                clock.anchor = screen_position(x, y, screens)
+                clock.placed = (x, y)
+            entry = {"x": x, "y": y}
+            if clock.anchor is not None:
+                entry.update(zip(("screen", "rx", "ry"), clock.anchor))
+            data[tz] = {**entry, **clock.options}
+        return data
+
+    def watch_screens(self):
+        """Lay the clocks out again when a screen is added, removed or resized."""
+        self.relayout_timer = QTimer(self)
+        self.relayout_timer.setSingleShot(True)
+        self.relayout_timer.setInterval(100)   # one relayout for a burst of signals
+        self.relayout_timer.timeout.connect(self.relayout)
+        app = QApplication.instance()
+        app.screenAdded.connect(self.watch_screen)
+        app.screenRemoved.connect(lambda screen: self.relayout_timer.start())
+        app.primaryScreenChanged.connect(lambda screen: self.relayout_timer.start())
+        for screen in app.screens():
+            screen.geometryChanged.connect(lambda rect: self.relayout_timer.start())
+            screen.availableGeometryChanged.connect(lambda rect: self.relayout_timer.start())
+
+    def watch_screen(self, screen):
+        screen.geometryChanged.connect(lambda rect: self.relayout_timer.start())
+        screen.availableGeometryChanged.connect(lambda rect: self.relayout_timer.start())
+        self.relayout_timer.start()
+
+    @contextmanager
+    def batched(self):
+        # In board mode every change is painted and masked once at the end
+        board = self.board
+        if board is not None:
+            board.setUpdatesEnabled(False)
+            board.batching = True
+        try:
+            yield
+        finally:
+            if board is not None:
+                board.batching = False
+                board.update_mask()
+                board.setUpdatesEnabled(True)
+
+    def relayout(self):
+        if self.mode == "tray":
+            return
+        screens = screen_list(QApplication.instance())
+        if self.board is not None:
+            self.board.fit_screens()
+        moved = False
+        with self.batched():
+            for clock in self.clocks.values():
+                x, y = resolve_position(clock.anchor, int(clock.x()), int(clock.y()),
+                                        clock.width(), clock.height(), screens)
+                # The anchor is kept, so the clock goes back when its screen returns
+                clock.placed = (x, y)
+                if (x, y) != (int(clock.x()), int(clock.y())):
+                    clock.move(x, y)
+                    moved = True
+        if moved:
+            self.save_all_positions()
+
+    def auto_arrange(self):
+        if self.mode == "tray":
+            return
+        clocks = list(self.clocks.values())
+        screens = screen_list(QApplication.instance())
+        positions = shelf_pack([(clock.width(), clock.height()) for clock in clocks], screens)
+        with self.batched():
+            for clock, position in zip(clocks, positions):
+                if position is not None:
+                    clock.move(*position)
+        self.save_all_positions()
+
+    def save_all_positions(self):
+        self.writer.schedule(self.clock_entries(), self.settings)
+
+    def start_control_server(self):
+        from multiple_desktop_clocks.modules.controlserver import ControlServer
+        self.control = ControlServer(self.handle_command, self)
+        return self.control.listen()
+
+    def handle_command(self, command, args):
+        """Commands sent by later invocations, e.g. `multiple-desktop-clocks add Europe/Paris`."""
+        if command == "ping":
+            return about.__version__
+        if command == "list":
+            return self.clock_entries()
+        if command == "stats":
+            return get_metrics().snapshot()
+        if command not in ("add", "remove", "move") or not args:
+            raise ValueError(f"Unknown command: {command}")
+
+        timezone = args[0]
+        if command == "add":
+            if not get_engine().backend.is_valid(timezone):
+                raise ValueError(f"Unknown time zone: {timezone}")
+            x, y = (args[1], args[2]) if len(args) == 3 else (200, 200)
+            self.add_clock(timezone, x, y)
+            return None
+        if timezone not in self.clocks:
+            raise ValueError(f"No clock for {timezone}")
+        if command == "remove":
+            self.remove_clock(timezone)
+        else:
+            self.clocks[timezone].move(args[1], args[2])
+            self.save_all_positions()
+        return None
+
+
+    def prepare_timezone_index(self):
+        from multiple_desktop_clocks.modules.tzindex import get_timezone_index
+        get_timezone_index().dynamic_keys()
+
+    def add_timezone(self):
+        from multiple_desktop_clocks.modules.wtzpicker import get_timezone
+        tz, ok = get_timezone()
+        if ok and tz:
+            self.add_clock(tz)
+
+    def remove_timezone(self):
+        if not self.clocks:
+            return
+        tz_list = list(self.clocks.keys())
+        tz, ok = QInputDialog.getItem(None, "Remove time zone",
+                                      "Choose a timezone to remove:", tz_list, 0, False)
+        if ok and tz:
+            self.remove_clock(tz)
+
+    def remove_clock(self, timezone, save=True):
+        self.discard_clock(timezone)
+        self.clocksChanged.emit()
+        if save:
+            self.save_all_positions()
+
+    def discard_clock(self, timezone):
+        # Without clocksChanged, for callers that remove several clocks and emit once
+        get_metrics().forget_clock(timezone)
+        self.scheduler.unregister(self.clocks[timezone])
+        self.clocks[timezone].close()
+        del self.clocks[timezone]
+
+    def apply_config(self, document):
+        """Apply only the difference between config.json and the running clocks."""
+        clocks = document.get("clocks", {})
+        settings = document.get("settings", {})
+        if not isinstance(clocks, dict) or not isinstance(settings, dict):
+            return
+        backend_keys = ("tz_backend", "zoneinfo_path")
+        if any(settings.get(key) != self.settings.get(key) for key in backend_keys):
+            get_engine().set_backend(backend_from_settings(settings))
+            self.tzwatch.watch()
+            self.scheduler.wake()
+        backend = get_engine().backend
+        clocks = {tz: entry for tz, entry in clocks.items()
+                  if backend.is_valid(tz) and isinstance(entry, dict)}
+
+        mode = settings.get("mode", "window")
+        self.settings = dict(settings)
+        self.scheduler.frames.budget = float(self.settings.get("frame_budget", 0.5))
+        themes_changed = self.themes.load(self.settings)
+        if mode != self.mode:
+            self.mode = mode   # recreated below from the new entries
+            self.close_clocks()
+            self.sync_mode_actions()
+
+        removed = [tz for tz in self.clocks if tz not in clocks]
+        for timezone in removed:
+            self.discard_clock(timezone)
+
+        screens = screen_list(QApplication.instance())
+        for timezone, entry in clocks.items():
+            clock = self.clocks.get(timezone)
+            if clock is None:
+                continue
+            options = clock_options(entry)
+            if options.get("style") != clock.options.get("style"):
+                self.discard_clock(timezone)   # re-created below in its new style
+                removed.append(timezone)
+                continue
+            # Placed as in add_clocks(): the screen anchor wins over x and y
+            anchor = (entry["screen"], entry.get("rx", 0), entry.get("ry", 0)) if "screen" in entry else None
+            x, y = resolve_position(anchor, entry.get("x", 200), entry.get("y", 200),
+                                    clock.width(), clock.height(), screens)
+            if (int(clock.x()), int(clock.y())) != (x, y):
+                clock.move(x, y)
+            clock.anchor = anchor or screen_position(x, y, screens)
+            clock.placed = (x, y)
+            if options != clock.options:
+                old_options = clock.options
+                clock.options = dict(options)
+                if any(options.get(key) != old_options.get(key) for key in ("format", "label")):
+                    clock.set_format(options.get("format"), options.get("label"))
+                themes_changed = themes_changed or any(
+                    options.get(key) != old_options.get(key) for key in ("theme",) + THEME_KEYS)
+
+        if themes_changed:
+            self.restyle()
+
+        added = self.add_clocks([(tz, entry.get("x", 200), entry.get("y", 200), entry)
+                                 for tz, entry in clocks.items() if tz not in self.clocks], save=False)
+        if removed and not added:
+            self.clocksChanged.emit()   # add_clocks() already emitted it otherwise
+        self.scheduler.arm()
+
+    def set_snap(self, enabled):
+        self.settings["snap"] = enabled
+        self.save_all_positions()
+
+    def snap_index(self, moving):
+        """Index of the other clocks and the screens for a drag, or None when snapping is off."""
+        if not self.settings.get("snap", False):
+            return None
+        from multiple_desktop_clocks.modules.snapping import SnapIndex, rect_of, screen_rects
+        index = SnapIndex(int(self.settings.get("snap_distance", 12)))
+        for timezone, clock in self.clocks.items():
+            if clock is not moving:
+                index.insert(timezone, rect_of(clock))
+        index.screens = screen_rects(QApplication.screens())
+        return index
+
+    def fill_theme_menu(self):
+        self.theme_menu.clear()
+        for name in self.themes.names():
+            action = self.theme_menu.addAction(name)
+            action.setCheckable(True)
+            action.setChecked(name == self.themes.current)
+            action.triggered.connect(lambda checked, n=name: self.set_theme(n))
+
+    def set_theme(self, name):
+        if not self.themes.select(name):
+            return
+        self.settings["theme"] = name
+        self.restyle()
+        self.save_all_positions()
+
+    def restyle(self):
+        """Give every clock its theme again, in one batch."""
+        with self.batched():
+            for clock in self.clocks.values():
+                theme = self.themes.resolve(clock.options)
+                if theme is not clock.theme:
+                    clock.set_theme(theme)
+
+    def change_format(self):
+        if not self.clocks:
+            return
+        tz_list = list(self.clocks.keys())
+        tz, ok = QInputDialog.getItem(None, "Clock format",
+                                      "Choose a clock:", tz_list, 0, False)
+        if not (ok and tz):
+            return
+        clock = self.clocks[tz]
+        formats = list(PRESETS.keys())
+        current = clock.options.get("format", formats[0])
+        if current not in formats:
+            formats.append(current)
+        spec, ok = QInputDialog.getItem(None, "Clock format",
+                                        "Choose or type a format (%H %I %M %S %p %Y %m %d %a %A %b %B %Z %z %f %L):",
+                                        formats, formats.index(current), True)
+        if not (ok and spec):
+            return
+        label, ok = QInputDialog.getText(None, "Clock format", "Label (empty for the time zone name):",
+                                         text=clock.options.get("label", ""))
+        if not ok:
+            return
+        clock.set_format(spec, label)
+        self.scheduler.arm()
+        self.save_all_positions()
+
+    def show_about(self):
+        from multiple_desktop_clocks.modules.wabout import show_about_window
+        data = {
+            "version": about.__version__,
+            "package": about.__package__,
+            "program_name": about.__program_name__,
+            "author": about.__author__,
+            "email": about.__email__,
+            "description": about.__description__,
+            "url_source": about.__url_source__,
+            "url_doc": about.__url_doc__,
+            "url_funding": about.__url_funding__,
+            "url_bugs": about.__url_bugs__
+        }
+        
+        base_dir_path = os.path.dirname(os.path.abspath(__file__))
+        logo_path = os.path.join(base_dir_path, 'icons', 'logo.png')
+        
+        show_about_window(data, logo_path)
+
+
+    
+    def show_planner(self):
+        from multiple_desktop_clocks.modules.planner import planner_available
+        if not planner_available():
+            QMessageBox.information(None, "Meeting planner",
+                                    "The meeting planner needs NumPy:\n\npip install numpy")
+            return
+        if self.planner is None:
+            from multiple_desktop_clocks.modules.wplanner import PlannerWindow
+            self.planner = PlannerWindow(self.clocks.keys())
+            self.clocksChanged.connect(lambda: self.planner.set_zones(self.clocks.keys()))
+        self.planner.show()
+        self.planner.raise_()
+
+    def show_stats(self):
+        from multiple_desktop_clocks.modules.wstats import show_stats_window
+        show_stats_window(get_metrics())
+
+    def wakeups_per_second(self):
+        return self.scheduler.wakeups_per_second()
+
+    def exit_app(self):
+        self.scheduler.timer.stop()
+        self.writer.flush()
+        if self.control is not None:
+            self.control.close()
+        self.close_clocks()
+        QApplication.quit()
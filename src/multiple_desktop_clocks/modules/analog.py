@@ -0,0 +1,171 @@
+import math
+import time
+from collections import OrderedDict
+
+from PyQt5.QtCore import QPointF, QRectF, Qt
+from PyQt5.QtGui import QColor, QFont, QPainter, QPen, QPixmap, QRadialGradient
+from PyQt5.QtWidgets import QWidget
+
+from multiple_desktop_clocks.modules.clockface import get_glyph_cache
+from multiple_desktop_clocks.modules.metrics   import get_metrics
+
+DEFAULT_FACE = QColor("#c0202020")
+SECOND_HAND = QColor("#e04040")
+
+
+class FaceCache:
+    """Static dial pixmaps (shadow, ticks, numerals) shared by every clock with the same look."""
+
+    def __init__(self, limit=16):
+        self.limit = limit
+        self.faces = OrderedDict()   # (side, theme key, dpr) -> QPixmap
+        self.renders = 0
+
+    def face(self, side, theme, dpr):
+        key = (side, theme.key, dpr)
+        pixmap = self.faces.get(key)
+        if pixmap is None:
+            pixmap = self.faces[key] = self.render(side, theme, dpr)
+            self.renders += 1
+            if len(self.faces) > self.limit:
+                self.faces.popitem(last=False)
+        else:
+            self.faces.move_to_end(key)
+        return pixmap
+
+    def render(self, side, theme, dpr):
+        pixmap = QPixmap(int(side * dpr), int(side * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        r = side / 2.0
+        painter.translate(r, r)
+
+        # Dial with a soft shadow towards the rim
+        background = theme.background or DEFAULT_FACE
+        gradient = QRadialGradient(QPointF(0, 0), r)
+        gradient.setColorAt(0.0, background)
+        gradient.setColorAt(0.85, background)
+        gradient.setColorAt(1.0, QColor(0, 0, 0, 0))
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(gradient)
+        painter.drawEllipse(QPointF(0, 0), r, r)
+
+        # Ticks: long every five minutes
+        color = QColor(theme.color)
+        for i in range(60):
+            major = i % 5 == 0
+            painter.setPen(QPen(color, side / (60.0 if major else 120.0), cap=Qt.RoundCap))
+            inner = r * (0.78 if major else 0.84)
+            painter.drawLine(QPointF(0, -inner), QPointF(0, -r * 0.9))
+            painter.rotate(6)
+
+        # Numerals
+        font = QFont(theme.font.family(), max(int(side * 0.08), 6), QFont.Bold)
+        painter.setFont(font)
+        painter.setPen(color)
+        box = side * 0.16
+        for hour in range(1, 13):
+            angle = math.radians(hour * 30)
+            center = QPointF(math.sin(angle) * r * 0.64, -math.cos(angle) * r * 0.64)
+            painter.drawText(QRectF(center.x() - box / 2, center.y() - box / 2, box, box),
+                             Qt.AlignCenter, str(hour))
+        painter.end()
+        return pixmap
+
+
+_face_cache = None
+
+def get_face_cache():
+    global _face_cache
+    if _face_cache is None:
+        _face_cache = FaceCache()
+    return _face_cache
+
+
+def dial_side(theme):
+    # Twice the height of a digital clock of the same theme
+    return theme.height * 2
+
+def dial_label(options, timezone):
+    return options.get("label") or timezone.rsplit("/", 1)[-1].replace("_", " ")
+
+def dial_hands(local, show_seconds):
+    """(hours, minutes, seconds) on a 12-hour dial of the local time in seconds."""
+    m, s = divmod(local % 43200, 60)
+    h, m = divmod(m, 60)
+    return h, m, s if show_seconds else 0
+
+def paint_dial(painter, theme, hms, label, show_seconds, dpr):
+    """Draw the cached dial, the label and the hands with the top-left corner at the origin."""
+    side = dial_side(theme)
+    r = side / 2.0
+    painter.drawPixmap(0, 0, get_face_cache().face(side, theme, dpr))
+
+    # Label under the center, from the glyph cache
+    if label:
+        font = QFont(theme.font.family(), max(int(side * 0.06), 6))
+        pixmap = get_glyph_cache().pixmap(label, font, theme.color, dpr)
+        width = pixmap.width() / dpr
+        painter.drawPixmap(int(r - width / 2), int(r + side * 0.14), pixmap)
+
+    if hms is not None:
+        h, m, s = hms
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.translate(r, r)
+        color = QColor(theme.color)
+        hands = [((h + m / 60.0) * 30, r * 0.45, side / 30.0, color),
+                 ((m + s / 60.0) * 6, r * 0.7, side / 45.0, color)]
+        if show_seconds:
+            hands.append((s * 6, r * 0.78, side / 110.0, SECOND_HAND))
+        for angle, length, width, hand_color in hands:
+            painter.save()
+            painter.rotate(angle)
+            painter.setPen(QPen(hand_color, width, cap=Qt.RoundCap))
+            painter.drawLine(QPointF(0, r * 0.08), QPointF(0, -length))
+            painter.restore()
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(SECOND_HAND if show_seconds else color)
+        painter.drawEllipse(QPointF(0, 0), side / 40.0, side / 40.0)
+        painter.restore()
+
+
+class AnalogFace(QWidget):
+    """Analog clock: the cached static dial plus the hands and the label drawn on every tick."""
+
+    def __init__(self, theme, parent=None):
+        super().__init__(parent)
+        self.theme = theme
+        self.cache = get_face_cache()
+        self.label = ""
+        self.show_seconds = True
+        self.hms = None
+        self.timezone = None
+        self.metrics = get_metrics()
+
+    def side(self):
+        return dial_side(self.theme)
+
+    def set_theme(self, theme):
+        self.theme = theme
+        self.update()
+
+    def set_time(self, local, label, show_seconds):
+        hms = dial_hands(local, show_seconds)
+        if hms != self.hms or label != self.label or show_seconds != self.show_seconds:
+            self.hms, self.label, self.show_seconds = hms, label, show_seconds
+            self.update()
+
+    def paintEvent(self, event):
+        t0 = time.perf_counter()
+        painter = QPainter(self)
+        paint_dial(painter, self.theme, self.hms, self.label, self.show_seconds, self.devicePixelRatioF())
+        painter.end()
+
+        elapsed = time.perf_counter() - t0
+        self.metrics.record("repaint", elapsed)
+        if self.timezone is not None:
+            self.metrics.record_clock(self.timezone, elapsed)
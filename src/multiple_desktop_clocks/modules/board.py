@@ -0,0 +1,222 @@
+import time
+
+from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QBrush, QPainter, QRegion
+from PyQt5.QtWidgets import (QApplication, QFrame, QGraphicsObject, QGraphicsScene,
+                             QGraphicsView)
+
+from multiple_desktop_clocks.modules.analog    import dial_hands, dial_label, dial_side, paint_dial
+from multiple_desktop_clocks.modules.clockface import TextLayout
+from multiple_desktop_clocks.modules.geometry  import rounded_mask
+from multiple_desktop_clocks.modules.tzengine  import get_engine
+from multiple_desktop_clocks.modules.timesource import get_time_source
+from multiple_desktop_clocks.modules.metrics   import get_metrics
+from multiple_desktop_clocks.modules.session   import ExposeTracker
+from multiple_desktop_clocks.modules.formats   import compile_clock_format
+from multiple_desktop_clocks.modules.configure import clock_options
+from multiple_desktop_clocks.modules.themes    import get_theme_registry
+
+
+class ClockItem(QGraphicsObject):
+    """One clock drawn as an item of the board; its scene position is its screen position."""
+
+    def __init__(self, timezone, board, options=None):
+        super().__init__()
+        self.timezone = timezone
+        self.zone = get_engine().zone(timezone)
+        self.board = board
+        self.options = clock_options(options or {})
+        self.template = compile_clock_format(self.options, timezone)
+        self.theme = get_theme_registry().resolve(self.options)
+
+        self.layout_ = TextLayout(self.theme.font, self.theme.color)
+        self.width_ = 0
+        # "style": "analog" draws the shared cached dial of modules/analog.py
+        self.analog = self.options.get("style") == "analog"
+        self.hms = None
+        self.label = ""
+        self.tick_resolution = self.template.resolution
+        self.subsecond = self.template.subsecond and not self.analog
+        self.shown_second = None   # UTC second of the last update
+        self.snap = None   # SnapIndex while dragged
+        self.metrics = get_metrics()
+
+        self.setFlag(QGraphicsObject.ItemIsMovable)
+        self.setFlag(QGraphicsObject.ItemSendsGeometryChanges)
+        self.setCacheMode(QGraphicsObject.DeviceCoordinateCache)
+        self.update_time()
+
+    def is_visible_for_ticks(self):
+        return self.board.expose_tracker.exposed
+
+    def boundingRect(self):
+        return QRectF(0, 0, self.width_, self.height())
+
+    def paint(self, painter, option, widget=None):
+        t0 = time.perf_counter()
+        dpr = widget.devicePixelRatioF() if widget is not None else 1.0
+        if self.analog:
+            paint_dial(painter, self.theme, self.hms, self.label, self.template.has_seconds, dpr)
+        else:
+            area = option.exposedRect.toAlignedRect()
+            if self.theme.background is not None:
+                painter.fillRect(area, self.theme.background)
+            self.layout_.paint(painter, area, self.theme.height, dpr)
+
+        elapsed = time.perf_counter() - t0
+        self.metrics.record("repaint", elapsed)
+        self.metrics.record_clock(self.timezone, elapsed)
+
+    def set_theme(self, theme):
+        self.prepareGeometryChange()
+        self.theme = theme
+        self.layout_.set_style(theme.font, theme.color)
+        self.width_ = dial_side(theme) if self.analog else self.layout_.width + 20
+        self.board.update_mask()
+        self.update()
+
+    def set_format(self, spec, label=None):
+        for key, value in (("format", spec), ("label", label)):
+            if value:
+                self.options[key] = value
+            else:
+                self.options.pop(key, None)
+        self.template = compile_clock_format(self.options, self.timezone)
+        self.tick_resolution = self.template.resolution
+        self.subsecond = self.template.subsecond and not self.analog
+        self.update_time()
+
+    def update_time(self):
+        t0 = time.perf_counter()
+        now = get_time_source().now()
+        zone = self.zone
+        local = zone.local_seconds(now)
+        self.shown_second = int(now)
+        if self.analog:
+            self.update_dial(local)
+            self.metrics.record("format", time.perf_counter() - t0)
+            return
+        text = self.template.render(local, zone.offset, zone.abbr, now % 1.0)
+        changed = self.layout_.set_text(text, self.template.tail, self.theme.height)
+        self.metrics.record("format", time.perf_counter() - t0)
+        if changed is None:
+            return
+        width = self.layout_.width + 20
+        if width != self.width_:
+            self.prepareGeometryChange()
+            self.width_ = width
+            self.board.update_mask()
+        self.update(QRectF(changed))
+
+    def update_dial(self, local):
+        hms = dial_hands(local, self.template.has_seconds)
+        label = dial_label(self.options, self.timezone)
+        if (hms, label) == (self.hms, self.label):
+            return
+        self.hms, self.label = hms, label
+        side = dial_side(self.theme)
+        if side != self.width_:
+            self.prepareGeometryChange()
+            self.width_ = side
+            self.board.update_mask()
+        self.update()
+
+    def mask(self):
+        # A round dial, or the rounded rectangle of the text
+        radius = self.width_ // 2 if self.analog else self.theme.radius
+        return rounded_mask(int(self.width_), self.height(), radius).translated(
+            int(self.x() - self.board.origin.x()), int(self.y() - self.board.origin.y()))
+
+    def itemChange(self, change, value):
+        if change == QGraphicsObject.ItemPositionChange and self.snap is not None:
+            return QPointF(self.snap.snap(value.toPoint(), self.boundingRect().size().toSize()))
+        if change == QGraphicsObject.ItemPositionHasChanged:
+            self.board.update_mask()
+        return super().itemChange(change, value)
+
+    def mousePressEvent(self, event):
+        self.snap = self.tray_ref.snap_index(self) if hasattr(self, "tray_ref") else None
+        super().mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        super().mouseReleaseEvent(event)
+        self.snap = None
+        if hasattr(self, "tray_ref"):
+            self.tray_ref.save_all_positions()
+
+    # Same interface as StickyClock
+    def move(self, x, y):
+        self.setPos(x, y)
+
+    def width(self):
+        return self.width_
+
+    def height(self):
+        return dial_side(self.theme) if self.analog else self.theme.height
+
+    def show(self):
+        self.board.show()
+
+    def close(self):
+        self.board.remove_item(self)
+
+
+class ClockBoard(QGraphicsView):
+    """A single translucent window covering the desktop in which every clock is an item."""
+
+    def __init__(self):
+        self.scene_ = QGraphicsScene()
+        super().__init__(self.scene_)
+        self.items_ = []
+        self.batching = False   # mask updates are deferred while True
+        self.scheduler = None
+        self.expose_tracker = ExposeTracker(self, self.on_exposed_changed)
+
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.Tool)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.viewport().setAttribute(Qt.WA_TranslucentBackground)
+        self.viewport().setAutoFillBackground(False)
+        self.setBackgroundBrush(QBrush(Qt.transparent))
+        self.setFrameShape(QFrame.NoFrame)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+        self.setRenderHint(QPainter.SmoothPixmapTransform)
+
+        self.fit_screens()
+
+    def fit_screens(self):
+        # Scene coordinates are global screen coordinates
+        geometry = QApplication.primaryScreen().virtualGeometry()
+        self.origin = geometry.topLeft()
+        self.setGeometry(geometry)
+        self.setSceneRect(QRectF(geometry))
+
+    def on_exposed_changed(self, exposed):
+        if self.scheduler is not None:
+            if exposed:
+                self.scheduler.wake()
+            else:
+                self.scheduler.arm()
+
+    def add_item(self, item):
+        self.items_.append(item)
+        self.scene_.addItem(item)
+        self.update_mask()
+
+    def remove_item(self, item):
+        if item in self.items_:
+            self.items_.remove(item)
+            self.scene_.removeItem(item)
+            self.update_mask()
+
+    def update_mask(self):
+        if self.batching:
+            return
+        region = QRegion()
+        for item in self.items_:
+            region = region.united(item.mask())
+        if region.isEmpty():
+            self.hide()
+        else:
+            self.setMask(region)
@@ -0,0 +1,157 @@
+import time
+
+from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtGui import QPainter, QPixmap, QFontMetrics, QColor
+from PyQt5.QtWidgets import QWidget
+
+from multiple_desktop_clocks.modules.metrics import get_metrics
+
+
+class GlyphCache:
+    """Pre-rendered text pixmaps keyed by font, size, color and device pixel ratio."""
+
+    def __init__(self):
+        self.pixmaps = {}
+        self.metrics = {}
+
+    def font_metrics(self, font):
+        key = font.key()
+        metrics = self.metrics.get(key)
+        if metrics is None:
+            metrics = self.metrics[key] = QFontMetrics(font)
+        return metrics
+
+    def pixmap(self, text, font, color, dpr=1.0):
+        key = (font.key(), color, dpr, text)
+        pixmap = self.pixmaps.get(key)
+        if pixmap is None:
+            pixmap = self.pixmaps[key] = self.render(text, font, color, dpr)
+        return pixmap
+
+    def render(self, text, font, color, dpr):
+        metrics = self.font_metrics(font)
+        width = max(metrics.horizontalAdvance(text), 1)
+        pixmap = QPixmap(int(width * dpr), int(metrics.height() * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setFont(font)
+        painter.setPen(QColor(color))
+        painter.drawText(0, metrics.ascent(), text)
+        painter.end()
+        return pixmap
+
+    def advance(self, text, font):
+        return self.font_metrics(font).horizontalAdvance(text)
+
+
+_glyph_cache = None
+
+def get_glyph_cache():
+    global _glyph_cache
+    if _glyph_cache is None:
+        _glyph_cache = GlyphCache()
+    return _glyph_cache
+
+
+class TextLayout:
+    """Character cells of a clock text plus its static label, drawn from the glyph cache."""
+
+    def __init__(self, font, color):
+        self.font = font
+        self.color = color
+        self.cache = get_glyph_cache()
+        self.text = ""
+        self.label = ""
+        self.positions = []  # x of each character of self.text
+        self.text_end = 0
+        self.width = 0
+
+    def set_text(self, text, label, height):
+        """Return the rectangle to repaint, or None when nothing changed."""
+        if text == self.text and label == self.label:
+            return None
+        if label != self.label or len(text) != len(self.text):
+            old_width = self.width
+            self.text, self.label = text, label
+            self.layout_cells()
+            return QRect(0, 0, max(old_width, self.width), height)
+
+        # Same layout: only the cells of the characters that changed.
+        # With a proportional font a character of another width moves the rest.
+        changed = QRect()
+        advance = self.cache.advance
+        for i, (old, new) in enumerate(zip(self.text, text)):
+            if old != new:
+                if advance(old, self.font) != advance(new, self.font):
+                    old_width = self.width
+                    self.text = text
+                    self.layout_cells()
+                    return QRect(self.positions[i], 0, max(old_width, self.width) - self.positions[i], height)
+                end = self.positions[i + 1] if i + 1 < len(text) else self.text_end
+                changed = changed.united(QRect(self.positions[i], 0, end - self.positions[i], height))
+        self.text = text
+        return None if changed.isNull() else changed
+
+    def set_style(self, font, color):
+        """Return True when the width of the text changed."""
+        old_width = self.width
+        self.font, self.color = font, color
+        self.layout_cells()
+        return self.width != old_width
+
+    def layout_cells(self):
+        x = 0
+        self.positions = []
+        for ch in self.text:
+            self.positions.append(x)
+            x += self.cache.advance(ch, self.font)
+        self.text_end = x
+        self.width = x + self.cache.advance(self.label, self.font)
+
+    def paint(self, painter, area, height, dpr):
+        metrics = self.cache.font_metrics(self.font)
+        y = (height - metrics.height()) // 2
+        for x, ch in zip(self.positions, self.text):
+            if x <= area.right() and x + metrics.maxWidth() >= area.left():
+                painter.drawPixmap(x, y, self.cache.pixmap(ch, self.font, self.color, dpr))
+        if self.label and self.text_end <= area.right():
+            painter.drawPixmap(self.text_end, y, self.cache.pixmap(self.label, self.font, self.color, dpr))
+
+
+class ClockFace(QWidget):
+    """Draws the time digit by digit from the shared glyph cache, plus a static label."""
+
+    def __init__(self, font, color, parent=None):
+        super().__init__(parent)
+        self.layout_ = TextLayout(font, color)
+        self.background = None   # QColor, or None for a transparent window
+        self.timezone = None
+        self.metrics = get_metrics()
+
+    def set_text(self, text, label=""):
+        changed = self.layout_.set_text(text, label, self.height())
+        if changed is not None:
+            self.update(changed)
+
+    def text_width(self):
+        return self.layout_.width
+
+    def set_style(self, font, color, background):
+        self.layout_.set_style(font, color)
+        self.background = background
+        self.update()
+
+    def paintEvent(self, event):
+        t0 = time.perf_counter()
+        painter = QPainter(self)
+        if self.background is not None:
+            painter.fillRect(event.rect(), self.background)
+        self.layout_.paint(painter, event.rect(), self.height(), self.devicePixelRatioF())
+        painter.end()
+
+        elapsed = time.perf_counter() - t0
+        self.metrics.record("repaint", elapsed)
+        if self.timezone is not None:
+            self.metrics.record_clock(self.timezone, elapsed)
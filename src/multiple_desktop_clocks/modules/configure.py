@@ -1,19 +1,76 @@
 import os
 import json
 
-def load_config(config_path):
+import multiple_desktop_clocks.about as about
+
+CONFIG_PATH = os.path.join(os.path.expanduser("~"),".config",about.__package__,"config.json")
+
+def load_document(config_path):
     if os.path.exists(config_path):
         try:
             with open(config_path, "r") as f:
-                data = json.load(f)
-            return data.get("clocks", {})
+                return json.load(f)
         except:
             return {}
     return {}
 
-def save_config(config_path, clocks):
+def load_config(config_path):
+    return load_document(config_path).get("clocks", {})
+
+def load_settings(config_path):
+    return load_document(config_path).get("settings", {})
+
+def dump_config(clocks, settings=None):
     data = {"clocks": clocks}
-    directory_name = os.path.dirname(config_path)
+    if settings:
+        data["settings"] = settings
+    return json.dumps(data, indent=4)
+
+def write_atomic(path, text):
+    # temp file + fsync + rename: readers see the old or the new file, never half of one
+    directory_name = os.path.dirname(path)
     os.makedirs(directory_name, exist_ok=True)
-    with open(config_path, "w") as f:
-        json.dump(data, f, indent=4)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    try:
+        fd = os.open(directory_name, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+def save_config(config_path, clocks, settings=None):
+    write_atomic(config_path, dump_config(clocks, settings))
+
+def load_zone_list(path):
+    # JSON (list of zones or a config file) or plain text with one zone per line
+    with open(os.path.expanduser(path), "r") as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+    except ValueError:
+        zones = []
+        for line in text.splitlines():
+            line = line.split("#", 1)[0].strip()
+            if line:
+                zones.append(line.split()[0])
+        return zones
+    if isinstance(data, dict):
+        data = data.get("clocks", data)
+    zones = list(data) if isinstance(data, (dict, list)) else None
+    if zones is None or not all(isinstance(zone, str) for zone in zones):
+        raise ValueError("expected a list of time zones or a config file")
+    return zones
+
+# Keys of the position of a clock: absolute x/y plus the screen-relative anchor
+POSITION_KEYS = ("x", "y", "screen", "rx", "ry")
+
+def clock_options(entry):
+    # Everything saved for a clock except its position
+    return {key: value for key, value in entry.items() if key not in POSITION_KEYS}
@@ -0,0 +1,55 @@
+import json
+import os
+
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+
+class ConfigWatcher(QObject):
+    """Emits changed(document) when config.json is modified by another program."""
+
+    changed = pyqtSignal(dict)
+
+    def __init__(self, config_path, writer, delay_ms=200, parent=None):
+        super().__init__(parent)
+        self.config_path = config_path
+        self.writer = writer
+
+        # The directory is watched too: an atomic rename replaces the watched file
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.on_event)
+        self.watcher.directoryChanged.connect(self.on_event)
+        self.watch()
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.reload)
+
+    def watch(self):
+        directory_name = os.path.dirname(self.config_path)
+        os.makedirs(directory_name, exist_ok=True)
+        if directory_name not in self.watcher.directories():
+            self.watcher.addPath(directory_name)
+        if os.path.exists(self.config_path) and self.config_path not in self.watcher.files():
+            self.watcher.addPath(self.config_path)
+
+    def on_event(self, path):
+        self.timer.start()
+
+    def reload(self):
+        self.watch()
+        try:
+            with open(self.config_path, "r") as f:
+                text = f.read()
+        except OSError:
+            return
+        if self.writer.is_own_content(text):
+            return
+        try:
+            document = json.loads(text)
+        except ValueError:
+            return  # half-written by a non-atomic editor; the next event brings the rest
+        if not isinstance(document, dict):
+            return
+        self.writer.accept_external(text)
+        self.changed.emit(document)
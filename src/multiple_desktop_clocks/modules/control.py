@@ -0,0 +1,121 @@
+import json
+import os
+import socket
+import sys
+
+import multiple_desktop_clocks.about as about
+from multiple_desktop_clocks.modules.configure import (CONFIG_PATH, load_config, load_settings,
+                                                       save_config)
+
+# Command -> usage; these never import Qt on the client side
+COMMANDS = {
+    "add": "add TIMEZONE [X Y]",
+    "remove": "remove TIMEZONE",
+    "list": "list",
+    "move": "move TIMEZONE X Y",
+    "stats": "stats",
+}
+
+
+class ControlError(Exception):
+    pass
+
+
+def socket_path():
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, f"{about.__package__}.sock")
+    return os.path.join("/tmp", f"{about.__package__}-{os.getuid()}.sock")
+
+
+def parse_command(args):
+    """Validate a command line and return the request sent to the running instance."""
+    if not args or args[0] not in COMMANDS:
+        raise ControlError("Unknown command. Commands: " + ", ".join(COMMANDS.values()))
+    command, params = args[0], args[1:]
+    counts = {"add": (1, 3), "remove": (1,), "list": (0,), "move": (3,), "stats": (0,)}
+    if len(params) not in counts[command]:
+        raise ControlError(f"Usage: {about.__program_name__} {COMMANDS[command]}")
+    if command in ("add", "move") and len(params) == 3:
+        try:
+            params = [params[0], int(params[1]), int(params[2])]
+        except ValueError:
+            raise ControlError("X and Y must be integers")
+    return {"command": command, "args": params}
+
+
+def send_request(request, timeout=2.0):
+    """Send a request to the running instance; None when no instance is listening."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    try:
+        client.connect(socket_path())
+    except (FileNotFoundError, ConnectionRefusedError, socket.timeout):
+        client.close()
+        return None
+    try:
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        data = b""
+        while not data.endswith(b"\n"):
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    finally:
+        client.close()
+    return json.loads(data.decode("utf-8")) if data else {"ok": False, "error": "No reply"}
+
+
+def is_running():
+    return send_request({"command": "ping", "args": []}) is not None
+
+
+def apply_offline(request, config_path=CONFIG_PATH):
+    """Apply a request to config.json when no instance is running."""
+    command, args = request["command"], request["args"]
+    clocks = load_config(config_path)
+    if command == "list":
+        return {"ok": True, "result": clocks}
+    if command == "stats":
+        return {"ok": False, "error": f"{about.__program_name__} is not running"}
+
+    timezone = args[0]
+    if command == "add":
+        from multiple_desktop_clocks.modules.tzbackend import backend_from_settings
+        if not backend_from_settings(load_settings(config_path)).is_valid(timezone):
+            return {"ok": False, "error": f"Unknown time zone: {timezone}"}
+        if timezone not in clocks:
+            x, y = (args[1], args[2]) if len(args) == 3 else (200, 200)
+            clocks[timezone] = {"x": x, "y": y}
+    elif timezone not in clocks:
+        return {"ok": False, "error": f"No clock for {timezone}"}
+    elif command == "remove":
+        del clocks[timezone]
+    elif command == "move":
+        # The absolute position replaces the screen-relative one
+        for key in ("screen", "rx", "ry"):
+            clocks[timezone].pop(key, None)
+        clocks[timezone].update({"x": args[1], "y": args[2]})
+    save_config(config_path, clocks, load_settings(config_path))
+    return {"ok": True, "result": None}
+
+
+def main(args):
+    try:
+        request = parse_command(args)
+    except ControlError as e:
+        print(e, file=sys.stderr)
+        return 2
+    reply = send_request(request)
+    if reply is None:
+        reply = apply_offline(request)
+    if not reply.get("ok"):
+        print(reply.get("error", "Error"), file=sys.stderr)
+        return 1
+    result = reply.get("result")
+    if request["command"] == "list":
+        for timezone, entry in result.items():
+            print(f"{timezone}\t{entry.get('x', 200)}\t{entry.get('y', 200)}")
+    elif result is not None:
+        print(json.dumps(result, indent=2))
+    return 0
@@ -0,0 +1,71 @@
+import json
+import sys
+
+from PyQt5.QtCore import QObject
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
+
+from multiple_desktop_clocks.modules.control import socket_path
+
+
+class ControlServer(QObject):
+    """Receives the commands of later invocations on the Unix-domain socket."""
+
+    def __init__(self, handler, parent=None):
+        super().__init__(parent)
+        self.handler = handler   # callable(command, args) -> result
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self.on_new_connection)
+        self.buffers = {}
+
+    def listen(self):
+        path = socket_path()
+        # With socket options listen() renames its socket over the path, even one in use
+        if self.is_answered(path):
+            print(f"Control socket {path}: another instance is listening", file=sys.stderr)
+            return False
+        if self.server.listen(path):
+            return True
+        # Nobody answers: a stale socket of a crashed instance
+        QLocalServer.removeServer(path)
+        if not self.server.listen(path):
+            print(f"Control socket {path}: {self.server.errorString()}", file=sys.stderr)
+            return False
+        return True
+
+    @staticmethod
+    def is_answered(path, timeout_ms=500):
+        probe = QLocalSocket()
+        probe.connectToServer(path)
+        answered = probe.waitForConnected(timeout_ms)
+        probe.abort()
+        return answered
+
+    def close(self):
+        self.server.close()
+
+    def on_new_connection(self):
+        while self.server.hasPendingConnections():
+            connection = self.server.nextPendingConnection()
+            self.buffers[connection] = b""
+            connection.readyRead.connect(lambda c=connection: self.on_ready_read(c))
+            connection.disconnected.connect(lambda c=connection: self.forget(c))
+
+    def forget(self, connection):
+        self.buffers.pop(connection, None)
+        connection.deleteLater()
+
+    def on_ready_read(self, connection):
+        self.buffers[connection] = self.buffers.get(connection, b"") + bytes(connection.readAll())
+        if not self.buffers[connection].endswith(b"\n"):
+            return
+        try:
+            request = json.loads(self.buffers[connection].decode("utf-8"))
+            result = self.handler(request.get("command"), request.get("args", []))
+            reply = {"ok": True, "result": result}
+        except Exception as e:   # a failed command must not reach the event loop
+            reply = {"ok": False, "error": str(e) or type(e).__name__}
+        self.buffers[connection] = b""
+        connection.write(json.dumps(reply).encode("utf-8") + b"\n")
+        connection.flush()
+        connection.disconnectFromServer()
@@ -0,0 +1,171 @@
+import sys
+from datetime import date
+
+DEFAULT_FORMAT = "%H:%M:%S %L"
+
+PRESETS = {
+    "24h": "%H:%M:%S %L",
+    "24h, no seconds": "%H:%M %L",
+    "12h": "%I:%M:%S %p %L",
+    "12h, no seconds": "%I:%M %p %L",
+    "Date and time": "%Y-%m-%d %H:%M:%S %L",
+    "Weekday and time": "%a %H:%M:%S %L",
+    "Time and UTC offset": "%H:%M:%S %Z (UTC%z) %L",
+}
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Unit of each field: what has to roll over for its text to change
+SECOND, MINUTE, HOUR, DAY, OFFSET, FRACTION = range(6)
+UNIT_SECONDS = {SECOND: 1, MINUTE: 60, HOUR: 3600, DAY: 86400}
+
+# %f is milliseconds; %1f, %2f and %3f give tenths, hundredths and milliseconds
+MAX_PRECISION = 3
+
+def _offset(offset):
+    sign = "+" if offset >= 0 else "-"
+    h, m = divmod(abs(offset) // 60, 60)
+    return f"{sign}{h:02d}:{m:02d}"
+
+# directive -> (unit, function(local_seconds, day_date, offset, abbr) -> str)
+DIRECTIVES = {
+    "S": (SECOND, lambda t, d, o, a: "%02d" % (t % 60)),
+    "M": (MINUTE, lambda t, d, o, a: "%02d" % (t // 60 % 60)),
+    "H": (HOUR,   lambda t, d, o, a: "%02d" % (t // 3600 % 24)),
+    "I": (HOUR,   lambda t, d, o, a: "%02d" % ((t // 3600 % 24 + 11) % 12 + 1)),
+    "p": (HOUR,   lambda t, d, o, a: "AM" if t // 3600 % 24 < 12 else "PM"),
+    "d": (DAY,    lambda t, d, o, a: "%02d" % d.day),
+    "e": (DAY,    lambda t, d, o, a: "%d" % d.day),
+    "m": (DAY,    lambda t, d, o, a: "%02d" % d.month),
+    "Y": (DAY,    lambda t, d, o, a: "%04d" % d.year),
+    "y": (DAY,    lambda t, d, o, a: "%02d" % (d.year % 100)),
+    "a": (DAY,    lambda t, d, o, a: d.strftime("%a")),
+    "A": (DAY,    lambda t, d, o, a: d.strftime("%A")),
+    "b": (DAY,    lambda t, d, o, a: d.strftime("%b")),
+    "B": (DAY,    lambda t, d, o, a: d.strftime("%B")),
+    "z": (OFFSET, lambda t, d, o, a: _offset(o)),
+    "Z": (OFFSET, lambda t, d, o, a: a),
+}
+
+
+class FormatError(ValueError):
+    pass
+
+
+class Template:
+    """A display format compiled into static text and dynamic fields.
+
+    Each dynamic field remembers the value of its unit (fraction of a second,
+    second, minute, hour, day or UTC offset) and is only formatted again when
+    that unit rolls over.
+    Static text after the last dynamic field is kept apart as `tail`, so it can
+    be drawn as a single cached pixmap.
+    """
+
+    def __init__(self, spec, label):
+        self.spec = spec
+        self.label = label
+        parts = []      # literal strings or [unit, func] fields ([FRACTION, digits] for %f)
+        literal = ""
+        i = 0
+        while i < len(spec):
+            ch = spec[i]
+            if ch == "%" and i + 1 < len(spec):
+                code = spec[i + 1]
+                i += 2
+                digits = None
+                if code.isdigit() and i < len(spec) and spec[i] == "f":
+                    digits = int(code)
+                    code = "f"
+                    i += 1
+                    if not 1 <= digits <= MAX_PRECISION:
+                        raise FormatError(f"%{digits}f: 1 to {MAX_PRECISION} digits in {spec!r}")
+                if code == "%":
+                    literal += "%"
+                elif code == "L":
+                    literal += label
+                elif code == "f":
+                    if literal:
+                        parts.append(literal)
+                        literal = ""
+                    parts.append([FRACTION, digits or MAX_PRECISION])
+                elif code in DIRECTIVES:
+                    if literal:
+                        parts.append(literal)
+                        literal = ""
+                    parts.append(list(DIRECTIVES[code]))
+                else:
+                    raise FormatError(f"Unknown directive %{code} in {spec!r}")
+            else:
+                literal += ch
+                i += 1
+
+        self.tail = literal
+        self.units = sorted({part[0] for part in parts if isinstance(part, list)})
+        self.has_seconds = SECOND in self.units
+        # Digits of the fraction asked for by the format, and those currently drawn
+        self.max_precision = max((part[1] for part in parts if isinstance(part, list) and part[0] == FRACTION),
+                                 default=0)
+        self.precision = self.max_precision
+        self.subsecond = self.max_precision > 0
+        self.resolution = 1 if self.has_seconds or self.subsecond else 60
+
+        self.parts = [part if isinstance(part, str) else "" for part in parts]
+        self.fields = [(i, part[0], part[1]) for i, part in enumerate(parts) if isinstance(part, list)]
+        self.keys = [None] * len(self.fields)
+        self.day_key = None
+        self.day = None
+
+    def next_change(self, local):
+        """Local epoch seconds at which the text may change next; None if only the offset can."""
+        units = [UNIT_SECONDS[unit] for unit in self.units if unit in UNIT_SECONDS]
+        if self.subsecond:
+            units.append(1)   # whole seconds: the fraction itself needs a frame driver
+        if not units:
+            return None
+        step = min(units)
+        return (local // step + 1) * step
+
+    def set_precision(self, digits):
+        """Draw at most `digits` digits of the fraction; the others are shown as zeros."""
+        digits = max(0, min(digits, self.max_precision))
+        if digits != self.precision:
+            self.precision = digits
+            self.keys = [None] * len(self.fields)
+
+    def render(self, local, offset=0, abbr="", fraction=0.0):
+        """Text of the dynamic part for the local epoch seconds `local` plus `fraction` of a second."""
+        precision = self.precision
+        unit_keys = (local, local // 60, local // 3600, local // 86400, (offset, abbr),
+                     int(fraction * 10 ** precision))
+        parts = self.parts
+        keys = self.keys
+        for n, (i, unit, func) in enumerate(self.fields):
+            key = unit_keys[unit]
+            if key != keys[n]:
+                keys[n] = key
+                if unit == FRACTION:
+                    # func is the number of digits of this field
+                    parts[i] = ("%0*d" % (precision, key) if precision else "")[:func].ljust(func, "0")
+                    continue
+                if unit == DAY and self.day_key != key:
+                    self.day_key = key
+                    self.day = date.fromordinal(EPOCH_ORDINAL + key)
+                parts[i] = func(local, self.day, offset, abbr)
+        return "".join(parts)
+
+
+def compile_format(spec=None, label=""):
+    if not spec:
+        spec = DEFAULT_FORMAT
+    spec = PRESETS.get(spec, spec)
+    return Template(spec, label)
+
+def compile_clock_format(options, timezone):
+    """Template of a clock from its config entry; the label defaults to the zone name."""
+    label = options.get("label") or timezone
+    try:
+        return compile_format(options.get("format"), label)
+    except FormatError as e:
+        print(f"{timezone}: {e}", file=sys.stderr)
+        return compile_format(None, label)
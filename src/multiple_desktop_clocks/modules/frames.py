@@ -0,0 +1,101 @@
+import time
+
+from PyQt5.QtCore import QObject, QTimer, Qt
+from PyQt5.QtGui import QGuiApplication
+
+from multiple_desktop_clocks.modules.formats import MAX_PRECISION
+from multiple_desktop_clocks.modules.metrics import get_metrics
+from multiple_desktop_clocks.modules.timesource import get_time_source
+
+
+class FrameDriver(QObject):
+    """Updates every visible sub-second (%f) clock once per display frame, in one pass.
+
+    The cost of a frame is the update pass plus what Qt spent repainting since
+    the previous one. When it stays over `budget` (a share of the frame
+    interval) the clocks drop a digit of the fraction, which also lowers the
+    frame rate: tenths only need ten frames a second. A long run of cheap
+    frames gives the digit back.
+    """
+
+    OVER_FRAMES = 10      # frames over the budget in a row before a digit is dropped
+    RECOVER_FRAMES = 600  # frames under a quarter of the budget in a row before it comes back
+
+    def __init__(self, parent=None, budget=0.5):
+        super().__init__(parent)
+        self.clocks = []
+        self.budget = budget
+        self.precision = MAX_PRECISION
+        self.over = 0
+        self.under = 0
+        self.cost = 0.0
+        self.metrics = get_metrics()
+        self.repaint_ms = self.metrics.histograms["repaint"].total
+        self.metrics.sources["frame_digits"] = lambda: self.precision if self.clocks else None
+        self.metrics.sources["frame_cost_ms"] = lambda: round(self.cost * 1000.0, 3)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.frame)
+
+    def set_clocks(self, clocks):
+        if clocks == self.clocks:
+            return
+        self.clocks = clocks
+        for clock in clocks:
+            clock.template.set_precision(self.precision)
+        if not clocks:
+            self.timer.stop()
+        elif not self.timer.isActive():
+            self.timer.start(0)
+
+    def remove(self, clock):
+        if clock in self.clocks:
+            self.set_clocks([c for c in self.clocks if c is not clock])
+
+    def frame_interval(self):
+        # Milliseconds per frame of the primary screen
+        screen = QGuiApplication.primaryScreen()
+        rate = screen.refreshRate() if screen is not None else 0
+        return 1000.0 / rate if rate > 0 else 1000.0 / 60
+
+    def frame(self):
+        t0 = time.perf_counter()
+        repaint_ms = self.metrics.histograms["repaint"].total
+        painted = (repaint_ms - self.repaint_ms) / 1000.0   # repaints since the previous frame
+        self.repaint_ms = repaint_ms
+        for clock in self.clocks:
+            clock.update_time()
+        interval = self.frame_interval()
+        self.adjust(time.perf_counter() - t0 + painted, interval)
+        self.schedule(interval)
+
+    def adjust(self, cost, interval):
+        self.cost = cost
+        limit = interval / 1000.0 * self.budget
+        if cost > limit:
+            self.over += 1
+            self.under = 0
+            if self.over >= self.OVER_FRAMES and self.precision > 1:
+                self.set_precision(self.precision - 1)
+        else:
+            self.over = 0
+            self.under = self.under + 1 if cost < limit / 4 else 0
+            if self.under >= self.RECOVER_FRAMES and self.precision < MAX_PRECISION:
+                self.set_precision(self.precision + 1)
+
+    def set_precision(self, digits):
+        self.precision = digits
+        self.over = self.under = 0
+        for clock in self.clocks:
+            clock.template.set_precision(digits)
+
+    def schedule(self, interval):
+        # Never faster than the screen, and on the boundary of the last digit drawn
+        source = get_time_source()
+        scale = 10 ** self.precision
+        delay = source.delay_ms((int(source.now() * scale) + 1) / scale)
+        if delay == float("inf"):   # a paused simulated clock
+            return
+        self.timer.start(int(delay) + 1 if delay > interval else round(interval))
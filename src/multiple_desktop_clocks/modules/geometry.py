@@ -0,0 +1,12 @@
+from functools import lru_cache
+
+from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QPainterPath, QRegion
+
+
+@lru_cache(maxsize=128)
+def rounded_mask(width, height, radius):
+    """Rounded-rectangle window mask, built once per (width, height, radius)."""
+    path = QPainterPath()
+    path.addRoundedRect(QRectF(0, 0, width, height), radius, radius)
+    return QRegion(path.toFillPolygon().toPolygon())
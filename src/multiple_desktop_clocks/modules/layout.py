@@ -0,0 +1,79 @@
+# Screen-relative clock positions and the auto-arrange layout.
+#
+# Screens are given as a list of (name, (x, y, width, height)) with their
+# available geometry; the first one is the primary screen.
+
+
+def screen_list(app):
+    screens = [app.primaryScreen()] + [s for s in app.screens() if s is not app.primaryScreen()]
+    result = []
+    for screen in screens:
+        if screen is None:
+            continue
+        g = screen.availableGeometry()
+        result.append((screen.name(), (g.x(), g.y(), g.width(), g.height())))
+    return result
+
+def contains(rect, x, y):
+    rx, ry, rw, rh = rect
+    return rx <= x < rx + rw and ry <= y < ry + rh
+
+def clamp(x, y, width, height, rect):
+    rx, ry, rw, rh = rect
+    x = max(rx, min(x, rx + rw - width))
+    y = max(ry, min(y, ry + rh - height))
+    return x, y
+
+def screen_position(x, y, screens):
+    """(screen name, rx, ry) of a global position; rx and ry are fractions of the screen."""
+    for name, rect in screens:
+        if contains(rect, x, y):
+            rx, ry, rw, rh = rect
+            return name, round((x - rx) / rw, 4), round((y - ry) / rh, 4)
+    return None
+
+def resolve_position(anchor, x, y, width, height, screens):
+    """Global position of a clock of the given size on the current screens.
+
+    The anchor (screen name, rx, ry) wins while its screen exists; otherwise
+    the absolute x/y is kept if it is on a screen, and the clock is always
+    pulled fully inside the screen it ends up on.
+    """
+    if not screens:
+        return x, y
+    rects = dict(screens)
+    if anchor is not None and anchor[0] in rects:
+        rx, ry, rw, rh = rect = rects[anchor[0]]
+        x, y = rx + round(anchor[1] * rw), ry + round(anchor[2] * rh)
+        return clamp(x, y, width, height, rect)
+    for name, rect in screens:
+        if contains(rect, x, y):
+            return clamp(x, y, width, height, rect)
+    return clamp(x, y, width, height, screens[0][1])
+
+def shelf_pack(sizes, screens, margin=10):
+    """Positions that pack rectangles of the given sizes in shelves across the screens.
+
+    The tallest rectangles go first; each shelf is filled left to right and a
+    new one starts below it, then on the next screen. What does not fit
+    anywhere starts over on the primary screen.
+    """
+    positions = [None] * len(sizes)
+    if not screens:
+        return positions
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    screen = 0
+    left, top, sw, sh = screens[0][1]
+    x, y, shelf = left + margin, top + margin, 0
+    for i in order:
+        w, h = sizes[i]
+        if x + w + margin > left + sw and x > left + margin:
+            x, y, shelf = left + margin, y + shelf + margin, 0
+        if y + h + margin > top + sh and y > top + margin:
+            screen = (screen + 1) % len(screens)
+            left, top, sw, sh = screens[screen][1]
+            x, y, shelf = left + margin, top + margin, 0
+        positions[i] = (x, y)
+        x += w + margin
+        shelf = max(shelf, h)
+    return positions
@@ -0,0 +1,110 @@
+import time
+from bisect import bisect_left
+
+from multiple_desktop_clocks.modules.timesource import get_time_source
+
+# Bucket upper bounds in milliseconds, roughly logarithmic
+BOUNDS_MS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000)
+
+
+class Histogram:
+    """Fixed-bucket histogram of durations, cheap enough to feed on every tick."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BOUNDS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        ms = seconds * 1000.0
+        self.counts[bisect_left(BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, p):
+        if not self.count:
+            return 0.0
+        rank = p * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(BOUNDS_MS[i], round(self.max, 4)) if i < len(BOUNDS_MS) else round(self.max, 4)
+        return round(self.max, 4)
+
+    def snapshot(self):
+        buckets = {}
+        for i, n in enumerate(self.counts):
+            if n:
+                key = f"<={BOUNDS_MS[i]}" if i < len(BOUNDS_MS) else f">{BOUNDS_MS[-1]}"
+                buckets[key] = n
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 4) if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max, 4),
+            "buckets": buckets,
+        }
+
+
+class RuntimeMetrics:
+    """Tick latency, drift and per-phase render cost of the clocks."""
+
+    PHASES = ("tick_latency", "format", "resize", "mask", "repaint", "drift")
+
+    def __init__(self):
+        self.started = time.time()
+        self.histograms = {name: Histogram() for name in self.PHASES}
+        self.per_clock = {}  # timezone -> Histogram of update + repaint cost
+        self.skipped_seconds = 0
+        self.sources = {}    # name -> callable returning extra values
+
+    def record(self, name, seconds):
+        self.histograms[name].record(seconds)
+
+    def record_clock(self, timezone, seconds):
+        histogram = self.per_clock.get(timezone)
+        if histogram is None:
+            histogram = self.per_clock[timezone] = Histogram()
+        histogram.record(seconds)
+
+    def record_drift(self, shown_second, resolution=1):
+        # How late a tick replaces the value shown since shown_second. A clock
+        # without seconds (resolution 60) is only measured when its minute is due.
+        source = get_time_source()
+        late = source.now() - (shown_second // resolution + 1) * resolution
+        if late < 0:
+            return
+        self.skipped_seconds += int(late // resolution)   # values that never appeared
+        # In real seconds, whatever the speed of the time source
+        self.histograms["drift"].record(late / (source.speed or 1.0))
+
+    def forget_clock(self, timezone):
+        self.per_clock.pop(timezone, None)
+
+    def snapshot(self):
+        data = {
+            "uptime_s": round(time.time() - self.started, 1),
+            "skipped_seconds": self.skipped_seconds,
+        }
+        for name, source in self.sources.items():
+            data[name] = source()
+        for name, histogram in self.histograms.items():
+            data[name] = histogram.snapshot()
+        data["clocks"] = {tz: h.snapshot() for tz, h in self.per_clock.items()}
+        return data
+
+
+_metrics = None
+
+def get_metrics():
+    global _metrics
+    if _metrics is None:
+        _metrics = RuntimeMetrics()
+    return _metrics
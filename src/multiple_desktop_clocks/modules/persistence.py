@@ -0,0 +1,107 @@
+import hashlib
+import queue
+import sys
+import threading
+from collections import deque
+
+from PyQt5.QtCore import QObject, QTimer
+
+from multiple_desktop_clocks.modules.configure import dump_config, write_atomic
+
+
+def content_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class ConfigWriter(QObject):
+    """Write-behind persistence of the clocks: debounced, deduplicated and atomic."""
+
+    def __init__(self, config_path, delay_ms=500, parent=None):
+        super().__init__(parent)
+        self.config_path = config_path
+        self.pending = None
+        self.last_hash = self.read_hash()   # newest content committed by this process
+        # What this process last wrote (or found) on disk, and the writes still queued:
+        # only these are its own content, an older write restored by another program is not
+        self.disk_hash = self.last_hash
+        self.queued = deque()
+        self.lock = threading.Lock()
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.commit)
+
+        self.queue = queue.Queue()
+        self.worker = threading.Thread(target=self.run, name="config-writer", daemon=True)
+        self.worker.start()
+
+    def read_hash(self):
+        try:
+            with open(self.config_path, "r") as f:
+                return content_hash(f.read())
+        except OSError:
+            return None
+
+    def schedule(self, clocks, settings=None):
+        # Changes arriving inside the window are collected into one write
+        self.pending = (clocks, settings)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def commit(self):
+        if self.pending is None:
+            return
+        text = dump_config(*self.pending)
+        self.pending = None
+        digest = content_hash(text)
+        if digest == self.last_hash:
+            return
+        self.last_hash = digest
+        with self.lock:
+            self.queued.append(digest)
+        self.queue.put(text)
+
+    def is_own_content(self, text):
+        digest = content_hash(text)
+        with self.lock:
+            return digest == self.disk_hash or digest in self.queued
+
+    def accept_external(self, text):
+        # Content written by someone else and already applied: no need to write it back
+        self.last_hash = content_hash(text)
+        with self.lock:
+            self.disk_hash = self.last_hash
+
+    def written(self, text):
+        # The skipped older snapshots were queued before this one
+        digest = content_hash(text)
+        with self.lock:
+            self.disk_hash = digest
+            while self.queued and self.queued.popleft() != digest:
+                pass
+
+    def run(self):
+        while True:
+            text = self.queue.get()
+            if text is None:
+                break
+            # Only the newest snapshot matters
+            while not self.queue.empty():
+                newer = self.queue.get()
+                if newer is None:
+                    self.queue.put(None)
+                    break
+                text = newer
+            try:
+                write_atomic(self.config_path, text)
+            except OSError as e:
+                print(f"Error saving {self.config_path}: {e}", file=sys.stderr)
+            else:
+                self.written(text)
+
+    def flush(self):
+        self.timer.stop()
+        self.commit()
+        self.queue.put(None)
+        self.worker.join(timeout=5)
@@ -0,0 +1,75 @@
+try:
+    import numpy as np
+except ImportError:  # optional: pip install multiple_desktop_clocks[planner]
+    np = None
+
+from multiple_desktop_clocks.modules.tzengine import get_engine
+
+# Cell kinds of the grid
+NIGHT, OFF_HOURS, BUSINESS = range(3)
+
+WORK_HOURS = (9, 17)    # local hours, Monday to Friday
+NIGHT_HOURS = (22, 7)   # from 22:00 to 07:00
+
+
+def planner_available():
+    return np is not None
+
+
+class PlannerGrid:
+    """Local times of every zone over the next slots, computed in one pass with NumPy.
+
+    The transitions of all zones are concatenated into one sorted array of
+    keys zone * span + (transition - start), so the offset of every
+    (zone, slot) pair comes from a single searchsorted.
+    """
+
+    def __init__(self, zones, start, slots, slot_seconds, work_hours=WORK_HOURS):
+        self.zones = list(zones)
+        self.start = int(start) // slot_seconds * slot_seconds
+        self.slot_seconds = slot_seconds
+        self.times = self.start + slot_seconds * np.arange(slots, dtype=np.int64)
+
+        self.offsets, self.abbr_index, self.abbrs = self.lookup()
+        self.local = self.times[None, :] + self.offsets
+
+        minute = self.local // 60 % 1440
+        weekday = (self.local // 86400 + 3) % 7   # 1970-01-01 was a Thursday; Monday is 0
+        business = (weekday < 5) & (minute >= work_hours[0] * 60) & (minute < work_hours[1] * 60)
+        night = (minute >= NIGHT_HOURS[0] * 60) | (minute < NIGHT_HOURS[1] * 60)
+        self.kind = np.where(business, BUSINESS, np.where(night, NIGHT, OFF_HOURS)).astype(np.uint8)
+
+        # Slot in which the offset of the zone differs from the previous slot
+        self.dst_change = np.zeros(self.offsets.shape, dtype=bool)
+        self.dst_change[:, 1:] = self.offsets[:, 1:] != self.offsets[:, :-1]
+        # Slots that are business hours in every zone
+        self.overlap = business.all(axis=0) if self.zones else np.zeros(slots, dtype=bool)
+
+    def lookup(self):
+        lo = int(self.times[0]) - 1
+        hi = int(self.times[-1]) + 1
+        span = hi - lo + 1
+        engine = get_engine()
+        keys, offsets, abbr_ids, abbrs, abbr_ids_of = [], [], [], [], {}
+        for z, name in enumerate(self.zones):
+            table = engine.table(name)
+            # Transitions outside the window collapse onto its edges, which keeps the order
+            transitions = np.clip(np.array(table.transitions, dtype=np.float64), lo, hi).astype(np.int64)
+            keys.append(z * span + (transitions - lo))
+            offsets.append(np.array(table.offsets, dtype=np.int64))
+            abbr_ids.append(np.array([abbr_ids_of.setdefault(a, len(abbr_ids_of)) for a in table.abbrs],
+                                     dtype=np.int32))
+        abbrs = sorted(abbr_ids_of, key=abbr_ids_of.get)
+        if not self.zones:
+            empty = np.zeros((0, len(self.times)), dtype=np.int64)
+            return empty, empty.astype(np.int32), abbrs
+
+        keys = np.concatenate(keys)
+        query = np.arange(len(self.zones), dtype=np.int64)[:, None] * span + (self.times[None, :] - lo)
+        index = np.searchsorted(keys, query, side="right") - 1
+        return np.concatenate(offsets)[index], np.concatenate(abbr_ids)[index], abbrs
+
+    def local_text(self, row, column):
+        local = int(self.local[row, column])
+        h, m = local // 3600 % 24, local // 60 % 60
+        return f"{h:02d}:{m:02d} {self.abbrs[self.abbr_index[row, column]]}"
@@ -0,0 +1,125 @@
+import time
+from collections import deque
+
+from PyQt5.QtCore import QObject, QTimer, Qt
+
+from multiple_desktop_clocks.modules.frames import FrameDriver
+from multiple_desktop_clocks.modules.metrics import get_metrics
+from multiple_desktop_clocks.modules.timesource import get_time_source
+
+
+class TickScheduler(QObject):
+    """Single timer that updates every registered clock on the wall-clock second.
+
+    Clocks that are not visible are skipped, the timer stops when nothing is
+    visible or the session is idle, and it wakes on the minute when no visible
+    clock shows seconds (clock.tick_resolution == 60). Visible sub-second
+    clocks (clock.subsecond) are handed to the FrameDriver instead.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.clocks = {}       # registered clocks in order; a dict for O(1) removal
+        self.visible = set()   # clocks last reported visible by visibility_changed()
+        self._wakeups = deque(maxlen=512)
+        self.target = None
+        self.resolution = 1
+        self.session_idle = False
+        self.metrics = get_metrics()
+        self.metrics.sources["wakeups_per_second"] = self.wakeups_per_second
+        self.metrics.sources["wakeups_per_minute"] = self.wakeups_per_minute
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.tick)
+        self.frames = FrameDriver(self)
+
+    def register(self, clock):
+        self.clocks[clock] = None
+        if clock.is_visible_for_ticks():
+            self.visible.add(clock)
+        if clock.subsecond or not self.timer.isActive() or clock.tick_resolution < self.resolution:
+            self.arm()
+
+    def unregister(self, clock):
+        self.clocks.pop(clock, None)
+        self.visible.discard(clock)
+        self.frames.remove(clock)
+        if not self.clocks:
+            self.timer.stop()
+
+    def active_clocks(self):
+        """Visible clocks ticked every second or minute; the sub-second ones go to the FrameDriver."""
+        if self.session_idle:
+            visible = []
+        else:
+            visible = [clock for clock in self.clocks if clock.is_visible_for_ticks()]
+        self.frames.set_clocks([clock for clock in visible if clock.subsecond])
+        return [clock for clock in visible if not clock.subsecond]
+
+    def arm(self, active=None):
+        # Re-armed against the real time on every tick, so errors never accumulate.
+        if active is None:
+            active = self.active_clocks()
+        if not active:
+            self.timer.stop()
+            self.target = None
+            return
+        self.resolution = resolution = min(clock.tick_resolution for clock in active)
+        source = get_time_source()
+        self.target = (int(source.now()) // resolution + 1) * resolution
+        delay = source.delay_ms(self.target)
+        if delay == float("inf"):   # a paused simulated clock only moves when told to
+            self.timer.stop()
+            return
+        self.timer.start(int(delay) + 1)
+
+    def tick(self, on_time=True):
+        if on_time and self.target is not None:
+            source = get_time_source()
+            self.metrics.record("tick_latency", max((source.now() - self.target) / source.speed, 0.0))
+        self._wakeups.append(time.monotonic())
+        active = self.active_clocks()
+        for clock in active:
+            if on_time and clock.shown_second is not None:
+                self.metrics.record_drift(clock.shown_second, clock.tick_resolution)
+            clock.update_time()
+        self.arm(active)
+
+    def wake(self):
+        """Catch up right away, e.g. when a clock becomes visible again."""
+        self.timer.stop()
+        self.tick(on_time=False)
+
+    def visibility_changed(self, clock):
+        if clock.is_visible_for_ticks():
+            # Only this clock is stale; the others are still on time
+            self.visible.add(clock)
+            clock.update_time()
+            if clock.subsecond or not self.timer.isActive() or clock.tick_resolution < self.resolution:
+                self.arm()
+        else:
+            # The next tick skips it anyway; only stop once nothing is left to show
+            self.visible.discard(clock)
+            self.frames.remove(clock)
+            if not self.visible:
+                self.arm()
+
+    def set_session_idle(self, idle):
+        if idle == self.session_idle:
+            return
+        self.session_idle = idle
+        if idle:
+            self.arm()
+        else:
+            self.wake()
+
+    def wakeups_per_second(self, window=10.0):
+        now = time.monotonic()
+        count = sum(1 for t in self._wakeups if now - t <= window)
+        return count / window
+
+    def wakeups_per_minute(self):
+        now = time.monotonic()
+        return sum(1 for t in self._wakeups if now - t <= 60.0)
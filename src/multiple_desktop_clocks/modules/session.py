@@ -0,0 +1,97 @@
+from PyQt5.QtCore import QEvent, QObject, pyqtSignal, pyqtSlot
+
+try:
+    from PyQt5.QtDBus import QDBusConnection, QDBusInterface, QDBusPendingCallWatcher
+except ImportError:  # PyQt5 built without QtDBus
+    QDBusConnection = None
+
+# (service, path, interface) of the screen savers that report ActiveChanged
+SCREENSAVERS = (
+    ("org.freedesktop.ScreenSaver", "/org/freedesktop/ScreenSaver", "org.freedesktop.ScreenSaver"),
+    ("org.gnome.ScreenSaver", "/org/gnome/ScreenSaver", "org.gnome.ScreenSaver"),
+    ("org.mate.ScreenSaver", "/org/mate/ScreenSaver", "org.mate.ScreenSaver"),
+    ("org.cinnamon.ScreenSaver", "/org/cinnamon/ScreenSaver", "org.cinnamon.ScreenSaver"),
+)
+
+
+class SessionMonitor(QObject):
+    """Emits idle_changed(True) while the screen saver or the lock screen is active."""
+
+    idle_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.idle = False
+        self.watchers = []
+        if QDBusConnection is None:
+            return
+        bus = QDBusConnection.sessionBus()
+        if not bus.isConnected():
+            return
+        for service, path, interface in SCREENSAVERS:
+            bus.connect(service, path, interface, "ActiveChanged", self.on_active_changed)
+            # Initial state without blocking the startup
+            proxy = QDBusInterface(service, path, interface, bus)
+            if proxy.isValid():
+                watcher = QDBusPendingCallWatcher(proxy.asyncCall("GetActive"), self)
+                watcher.finished.connect(self.on_get_active)
+                self.watchers.append(watcher)
+
+    def on_get_active(self, watcher):
+        reply = watcher.reply()
+        if reply.arguments():
+            self.set_idle(bool(reply.arguments()[0]))
+        watcher.deleteLater()
+        self.watchers.remove(watcher)
+
+    @pyqtSlot(bool)
+    def on_active_changed(self, active):
+        self.set_idle(active)
+
+    def set_idle(self, idle):
+        if idle != self.idle:
+            self.idle = idle
+            self.idle_changed.emit(idle)
+
+
+# The only events ExposeTracker looks at; the filter sees every event of the widget
+TRACKED = frozenset((QEvent.Show, QEvent.Hide, QEvent.WindowStateChange, QEvent.Expose))
+
+
+class ExposeTracker(QObject):
+    """Calls callback(exposed) when a top-level widget is shown, hidden, exposed or obscured."""
+
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+        self.widget = widget
+        self.callback = callback
+        self.exposed = False
+        self.handle = None
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        kind = event.type()
+        if kind not in TRACKED:
+            return False
+        if obj is self.widget:
+            if kind == QEvent.Show:
+                self.watch_handle()
+                self.set_exposed(True)
+            elif kind == QEvent.Hide:
+                self.set_exposed(False)
+            elif kind == QEvent.WindowStateChange:
+                self.set_exposed(not obj.isMinimized() and obj.isVisible())
+        elif kind == QEvent.Expose:
+            self.set_exposed(obj.isExposed())
+        return False
+
+    def watch_handle(self):
+        handle = self.widget.windowHandle()
+        if handle is not None and handle is not self.handle:
+            self.handle = handle
+            handle.installEventFilter(self)
+
+    def set_exposed(self, exposed):
+        if exposed != self.exposed:
+            self.exposed = exposed
+            self.callback(exposed)
@@ -0,0 +1,80 @@
+from PyQt5.QtCore import QPoint
+
+
+class SnapIndex:
+    """Uniform grid of clock rectangles, so a drag only looks at the clocks near it.
+
+    Rectangles are (x, y, width, height) tuples in global coordinates. The
+    moving clock snaps to the edges of the clocks within `distance` pixels
+    and to the edges of the screens.
+    """
+
+    def __init__(self, distance=12, cell=256):
+        self.distance = distance
+        self.cell = cell
+        self.grid = {}   # (column, row) -> set of keys
+        self.rects = {}  # key -> rect
+        self.screens = []
+
+    def cells(self, rect, margin=0):
+        x, y, w, h = rect
+        c = self.cell
+        for column in range((x - margin) // c, (x + w + margin) // c + 1):
+            for row in range((y - margin) // c, (y + h + margin) // c + 1):
+                yield column, row
+
+    def insert(self, key, rect):
+        self.remove(key)
+        self.rects[key] = rect
+        for cell in self.cells(rect):
+            self.grid.setdefault(cell, set()).add(key)
+
+    def remove(self, key):
+        rect = self.rects.pop(key, None)
+        if rect is None:
+            return
+        for cell in self.cells(rect):
+            keys = self.grid.get(cell)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.grid[cell]
+
+    def near(self, rect):
+        found = set()
+        for cell in self.cells(rect, self.distance):
+            found.update(self.grid.get(cell, ()))
+        return [self.rects[key] for key in found]
+
+    def snap(self, pos, size):
+        """Return pos (a QPoint) moved onto the nearest edges within the snap distance."""
+        x, y, w, h = pos.x(), pos.y(), size.width(), size.height()
+        xs, ys = [], []
+        for ox, oy, ow, oh in self.near((x, y, w, h)):
+            xs += (ox, ox + ow)
+            ys += (oy, oy + oh)
+        for sx, sy, sw, sh in self.screens:
+            xs += (sx, sx + sw)
+            ys += (sy, sy + sh)
+        return QPoint(self.nearest(x, w, xs), self.nearest(y, h, ys))
+
+    def nearest(self, start, length, edges):
+        # Either side of the moving rectangle can land on an edge
+        best, best_delta = start, self.distance + 1
+        for edge in edges:
+            for candidate in (edge, edge - length):
+                delta = abs(candidate - start)
+                if delta < best_delta:
+                    best, best_delta = candidate, delta
+        return best
+
+
+def rect_of(clock):
+    return (int(clock.x()), int(clock.y()), int(clock.width()), int(clock.height()))
+
+def screen_rects(screens):
+    rects = []
+    for screen in screens:
+        g = screen.availableGeometry()
+        rects.append((g.x(), g.y(), g.width(), g.height()))
+    return rects
@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+
+_IMPORT_TIME = time.time()
+
+
+def process_start_time():
+    # Start of the process from /proc (Linux), else the import of this module
+    try:
+        with open("/proc/self/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        start_ticks = int(fields[19])
+        with open("/proc/stat") as f:
+            btime = next(int(line.split()[1]) for line in f if line.startswith("btime"))
+        return btime + start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, StopIteration):
+        return _IMPORT_TIME
+
+
+class StartupProfiler:
+    """Phase-by-phase timing from process start to the first painted clock."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.start = process_start_time()
+        self.last = self.start
+        self.phases = []
+        self.reported = False
+
+    def mark(self, name):
+        if not self.enabled:
+            return
+        now = time.time()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    def report(self, stream=sys.stderr):
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        print("Startup profile (ms):", file=stream)
+        for name, seconds in self.phases:
+            print(f"  {seconds * 1000:9.1f}  {name}", file=stream)
+        print(f"  {(self.last - self.start) * 1000:9.1f}  total", file=stream)
+
+    def watch_first_paint(self, app, timeout_ms=5000):
+        """Report when the first widget is painted after this call."""
+        if not self.enabled:
+            return
+        from PyQt5.QtCore import QObject, QEvent, QTimer
+
+        profiler = self
+
+        class FirstPaintFilter(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Paint:
+                    # The paint itself is included once control returns to the loop
+                    app.removeEventFilter(self)
+                    QTimer.singleShot(0, profiler.first_paint)
+                return False
+
+        self.filter = FirstPaintFilter()
+        app.installEventFilter(self.filter)
+        QTimer.singleShot(timeout_ms, self.report)
+
+    def first_paint(self):
+        self.mark("first clock painted")
+        self.report()
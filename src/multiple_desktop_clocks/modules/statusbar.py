@@ -0,0 +1,135 @@
+import json
+import os
+import sys
+import time
+
+from multiple_desktop_clocks.modules.configure  import CONFIG_PATH, clock_options, load_config, load_settings
+from multiple_desktop_clocks.modules.formats    import compile_format, FormatError
+from multiple_desktop_clocks.modules.timesource import get_time_source
+from multiple_desktop_clocks.modules.tzbackend  import backend_from_settings
+from multiple_desktop_clocks.modules.tzengine   import get_engine
+
+# Never imports PyQt5: it runs under i3bar or waybar on machines without the tray
+PROTOCOLS = ("i3bar", "waybar")
+STATUS_FORMAT = "%H:%M %L"
+
+
+class StatusClock:
+    """One zone of the bar: its offset table, its compiled format and its last text."""
+
+    def __init__(self, timezone, options):
+        self.timezone = timezone
+        self.zone = get_engine().zone(timezone)
+        # The bar is narrow: the city instead of the full zone name
+        label = options.get("label") or timezone.rsplit("/", 1)[-1].replace("_", " ")
+        try:
+            self.template = compile_format(options.get("format") or STATUS_FORMAT, label)
+        except FormatError as e:
+            print(f"{timezone}: {e}", file=sys.stderr)
+            self.template = compile_format(STATUS_FORMAT, label)
+        self.text = None
+
+    def render(self, now):
+        zone = self.zone
+        local = zone.local_seconds(now)
+        return self.template.render(local, zone.offset, zone.abbr) + self.template.tail
+
+    def next_change(self, now):
+        """UTC instant of the next possible change of the text."""
+        local = self.zone.local_seconds(now)
+        change = self.template.next_change(local)
+        candidates = [self.zone.until]
+        if change is not None:
+            candidates.append(change - self.zone.offset)
+        return min(candidates)
+
+
+class StatusBar:
+    """Writes the clocks of config.json as an i3bar or waybar JSON stream on stdout."""
+
+    def __init__(self, protocol="i3bar", config_path=CONFIG_PATH, out=sys.stdout):
+        self.protocol = protocol
+        self.config_path = config_path
+        self.out = out
+        self.mtime = None
+        self.clocks = []
+        self.backend_spec = None
+
+    def load(self):
+        # Reloaded when config.json changes, checked at every wake-up
+        try:
+            mtime = os.stat(self.config_path).st_mtime
+        except OSError:
+            mtime = None
+        if mtime == self.mtime and self.clocks:
+            return
+        self.mtime = mtime
+        settings = load_settings(self.config_path)
+        spec = (settings.get("tz_backend"), settings.get("zoneinfo_path"))
+        if spec != self.backend_spec:
+            self.backend_spec = spec
+            get_engine().set_backend(backend_from_settings(settings))
+        self.clocks = []
+        for timezone, entry in load_config(self.config_path).items():
+            # One bad zone must not stop the stream: the other clocks are kept
+            try:
+                self.clocks.append(StatusClock(timezone, clock_options(entry)))
+            except KeyError:
+                print(f"Unknown time zone: {timezone}", file=sys.stderr)
+            except (OSError, ValueError) as e:
+                print(f"{timezone}: {e}", file=sys.stderr)
+        if not self.clocks:
+            self.clocks = [StatusClock("UTC", {})]
+
+    def line(self, now):
+        changed = False
+        for clock in self.clocks:
+            text = clock.render(now)
+            if text != clock.text:
+                clock.text = text
+                changed = True
+        if not changed:
+            return None
+        if self.protocol == "waybar":
+            return json.dumps({"text": "  ".join(clock.text for clock in self.clocks),
+                               "tooltip": "\n".join(f"{clock.timezone}: {clock.text}" for clock in self.clocks),
+                               "class": "clocks"})
+        blocks = [{"name": "clock", "instance": clock.timezone, "full_text": clock.text}
+                  for clock in self.clocks]
+        return json.dumps(blocks) + ","
+
+    def write(self, text):
+        self.out.write(text + "\n")
+        self.out.flush()
+
+    def run(self, sleep=time.sleep):
+        source = get_time_source()
+        if self.protocol == "i3bar":
+            self.write(json.dumps({"version": 1}))
+            self.write("[")
+        while True:
+            self.load()
+            # A tzdata update is picked up at the next wake-up
+            get_engine().reload_changed()
+            now = source.now()
+            line = self.line(now)
+            if line is not None:
+                self.write(line)
+            # Sleep until the earliest instant at which any text can change
+            target = min(clock.next_change(now) for clock in self.clocks)
+            sleep(min(source.delay_ms(target) / 1000.0, 3600.0) + 0.001)
+
+
+def main(protocol="i3bar"):
+    if protocol not in PROTOCOLS:
+        print(f"Unknown status bar protocol: {protocol} ({', '.join(PROTOCOLS)})", file=sys.stderr)
+        return 2
+    try:
+        StatusBar(protocol).run()
+    except (BrokenPipeError, KeyboardInterrupt):
+        # The bar went away
+        try:
+            sys.stdout.close()
+        except BrokenPipeError:
+            pass
+    return 0
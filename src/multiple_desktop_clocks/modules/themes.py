@@ -0,0 +1,102 @@
+import sys
+
+from PyQt5.QtGui import QColor, QFont
+
+from multiple_desktop_clocks.modules.clockface import get_glyph_cache
+
+# Keys of a theme; each one can also be overridden in the entry of a clock
+THEME_KEYS = ("font", "size", "bold", "color", "background", "radius", "height")
+
+DEFAULT_THEME = "default"
+
+BUILTIN_THEMES = {
+    "default": {"font": "DejaVu Sans Mono", "size": 24, "bold": True, "color": "white",
+                "background": None, "radius": 20, "height": 80},
+    "dark":    {"color": "#e0e0e0", "background": "#c0202020"},
+    "light":   {"color": "#202020", "background": "#d0f0f0f0"},
+    "small":   {"size": 14, "radius": 12, "height": 44},
+}
+
+
+class Theme:
+    """Resolved style shared by every clock that uses it: font, colors and geometry."""
+
+    def __init__(self, name, values):
+        self.name = name
+        self.values = values
+        self.key = tuple(sorted(values.items()))   # equal for equal styles, whatever the name
+        self.font = QFont(values["font"], int(values["size"]),
+                          QFont.Bold if values["bold"] else QFont.Normal)
+        self.color = QColor(values["color"]).name(QColor.HexArgb)
+        background = values["background"]
+        self.background = QColor(background) if background else None
+        self.radius = int(values["radius"])
+        # Never smaller than the text itself
+        self.height = max(int(values["height"]), get_glyph_cache().font_metrics(self.font).height())
+
+
+class ThemeRegistry:
+    """Named themes of config.json ("settings": {"theme": ..., "themes": {...}}) plus the built-in ones.
+
+    A theme only lists the keys it changes; the others come from "default".
+    Themes are built once per (theme, per-clock overrides) and shared.
+    """
+
+    def __init__(self):
+        self.themes = dict(BUILTIN_THEMES)
+        self.current = DEFAULT_THEME
+        self.resolved = {}
+
+    def load(self, settings):
+        """Return True when the themes or the selected theme changed."""
+        themes = dict(BUILTIN_THEMES)
+        for name, values in (settings.get("themes") or {}).items():
+            if isinstance(values, dict):
+                themes[name] = {key: value for key, value in values.items() if key in THEME_KEYS}
+        current = settings.get("theme", DEFAULT_THEME)
+        if current not in themes:
+            print(f"Unknown theme: {current}", file=sys.stderr)
+            current = DEFAULT_THEME
+        if themes == self.themes and current == self.current:
+            return False
+        self.themes = themes
+        self.current = current
+        self.resolved = {}
+        return True
+
+    def names(self):
+        return list(self.themes)
+
+    def select(self, name):
+        if name not in self.themes or name == self.current:
+            return False
+        self.current = name
+        return True
+
+    def resolve(self, options=None):
+        """Theme of a clock from its config entry ("theme" plus overridden keys)."""
+        options = options or {}
+        name = options.get("theme")
+        if name not in self.themes:
+            name = self.current
+        overrides = tuple(sorted((key, options[key]) for key in THEME_KEYS if key in options))
+        key = (name, overrides)
+        theme = self.resolved.get(key)
+        if theme is None:
+            values = {**self.themes[DEFAULT_THEME], **self.themes[name], **dict(overrides)}
+            try:
+                theme = Theme(name, values)
+            except (TypeError, ValueError) as e:
+                print(f"Theme {name}: {e}", file=sys.stderr)
+                theme = Theme(DEFAULT_THEME, dict(BUILTIN_THEMES[DEFAULT_THEME]))
+            self.resolved[key] = theme
+        return theme
+
+
+_theme_registry = None
+
+def get_theme_registry():
+    global _theme_registry
+    if _theme_registry is None:
+        _theme_registry = ThemeRegistry()
+    return _theme_registry
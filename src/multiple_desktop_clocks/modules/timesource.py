@@ -0,0 +1,115 @@
+import re
+import subprocess
+import sys
+import time
+
+
+class SystemTimeSource:
+    """The wall clock of the system."""
+
+    speed = 1.0
+
+    def now(self):
+        return time.time()
+
+    def delay_ms(self, target):
+        """Real milliseconds until this clock reads `target`."""
+        return max((target - self.now()) / self.speed * 1000.0, 0.0)
+
+    def describe(self):
+        return "system"
+
+
+class OffsetTimeSource(SystemTimeSource):
+    """The system clock corrected by a fixed offset in seconds, e.g. measured by chrony."""
+
+    def __init__(self, offset):
+        self.offset = float(offset)
+
+    def now(self):
+        return time.time() + self.offset
+
+    def describe(self):
+        return f"system {self.offset:+.6f} s"
+
+    @classmethod
+    def from_chrony(cls, path=None):
+        """Offset from `chronyc tracking`, or from a file holding its output."""
+        if path:
+            with open(path, "r") as f:
+                text = f.read()
+        else:
+            text = subprocess.run(["chronyc", "tracking"], capture_output=True, text=True,
+                                  timeout=2, check=True).stdout
+        return cls(parse_chrony_tracking(text))
+
+
+_CHRONY_SYSTEM_TIME = re.compile(r"^System time\s*:\s*([0-9.eE+-]+)\s+seconds\s+(fast|slow)", re.MULTILINE)
+
+def parse_chrony_tracking(text):
+    """Seconds to add to the system clock to get NTP time."""
+    match = _CHRONY_SYSTEM_TIME.search(text)
+    if match is None:
+        raise ValueError("No 'System time' line in the chrony tracking output")
+    seconds = float(match.group(1))
+    # "fast of NTP time": the system clock is ahead, so the correction is negative
+    return -seconds if match.group(2) == "fast" else seconds
+
+
+class SimulatedTimeSource(SystemTimeSource):
+    """A clock that starts at `start` and runs `speed` times faster than real time.
+
+    With speed 0 it only moves through advance(), which lets tests and
+    benchmarks drive any span of time without waiting.
+    """
+
+    def __init__(self, start=None, speed=1.0):
+        self.start = time.time() if start is None else float(start)
+        self.speed = float(speed)
+        self.base = time.monotonic()
+
+    def now(self):
+        return self.start + (time.monotonic() - self.base) * self.speed
+
+    def advance(self, seconds):
+        self.start += seconds
+
+    def set_speed(self, speed):
+        self.start = self.now()
+        self.base = time.monotonic()
+        self.speed = float(speed)
+
+    def delay_ms(self, target):
+        if self.speed <= 0:
+            return float("inf")   # nothing happens until advance()
+        return super().delay_ms(target)
+
+    def describe(self):
+        return f"simulated x{self.speed:g}"
+
+
+def time_source_from_settings(settings):
+    """settings["time_source"]: {"type": "system" | "offset" | "simulated", ...}"""
+    spec = settings.get("time_source") or {}
+    kind = spec.get("type", "system")
+    try:
+        if kind == "offset":
+            if "offset" in spec:
+                return OffsetTimeSource(spec["offset"])
+            chrony = spec.get("chrony")
+            return OffsetTimeSource.from_chrony(chrony if isinstance(chrony, str) else None)
+        if kind == "simulated":
+            return SimulatedTimeSource(spec.get("start"), spec.get("speed", 1.0))
+    except (OSError, ValueError, subprocess.SubprocessError) as e:
+        print(f"Time source {kind}: {e}", file=sys.stderr)
+    return SystemTimeSource()
+
+
+_time_source = SystemTimeSource()
+
+def get_time_source():
+    return _time_source
+
+def set_time_source(source):
+    global _time_source
+    _time_source = source
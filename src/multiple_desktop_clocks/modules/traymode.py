@@ -0,0 +1,222 @@
+import html
+import sys
+
+from PyQt5.QtCore import QObject, QRect, Qt, QTimer
+from PyQt5.QtGui import QColor, QFont, QIcon, QPainter, QPixmap
+
+from multiple_desktop_clocks.modules.tzengine  import get_engine
+from multiple_desktop_clocks.modules.formats   import compile_format, FormatError
+from multiple_desktop_clocks.modules.configure import clock_options
+from multiple_desktop_clocks.modules.themes    import get_theme_registry
+from multiple_desktop_clocks.modules.timesource import get_time_source
+
+TRAY_FORMAT = "%H:%M"
+ICON_SIZE = 64
+
+
+class TrayEntry:
+    """A clock without a window: it only keeps its text for the tray display.
+
+    It has the interface of StickyClock that ClockIndicator and TickScheduler
+    use, and remembers the position the clock has in the other modes.
+    """
+
+    def __init__(self, timezone, display, options=None):
+        self.timezone = timezone
+        self.display = display
+        self.zone = get_engine().zone(timezone)
+        self.options = clock_options(options or {})
+        self.theme = get_theme_registry().resolve(self.options)
+        self.pos_ = (200, 200)
+        self.text = ""
+        self.shown_second = None   # UTC second of the last update
+        self.compile()
+        self.update_time()
+
+    def compile(self):
+        # Without a format of its own the tray shows hours and minutes
+        try:
+            self.template = compile_format(self.options.get("format") or TRAY_FORMAT, "")
+        except FormatError as e:
+            print(f"{self.timezone}: {e}", file=sys.stderr)
+            self.template = compile_format(TRAY_FORMAT, "")
+        self.tick_resolution = self.template.resolution
+        self.subsecond = False   # the tray is not redrawn on every frame; %f shows whole seconds
+
+    def label(self):
+        return self.options.get("label") or self.timezone
+
+    def is_visible_for_ticks(self):
+        return True
+
+    def update_time(self):
+        now = get_time_source().now()
+        zone = self.zone
+        self.shown_second = int(now)
+        text = self.template.render(zone.local_seconds(now), zone.offset, zone.abbr) + self.template.tail
+        if text != self.text:
+            self.text = text
+            self.display.changed()
+
+    def set_format(self, spec, label=None):
+        for key, value in (("format", spec), ("label", label)):
+            if value:
+                self.options[key] = value
+            else:
+                self.options.pop(key, None)
+        self.compile()
+        self.text = ""
+        self.update_time()
+
+    def set_theme(self, theme):
+        self.theme = theme
+        self.display.changed()
+
+    # Same interface as StickyClock
+    def x(self):
+        return self.pos_[0]
+
+    def y(self):
+        return self.pos_[1]
+
+    def width(self):
+        return 0
+
+    def height(self):
+        return 0
+
+    def move(self, x, y=None):
+        if y is None:
+            x, y = x.x(), x.y()
+        self.pos_ = (int(x), int(y))
+
+    def show(self):
+        self.display.add_entry(self)
+
+    def close(self):
+        self.display.remove_entry(self)
+
+
+class TrayDisplay(QObject):
+    """Draws the clocks of the tray mode into the tray icon, its tooltip and the menu header.
+
+    Entries only report that their text changed; the three outputs are then
+    rebuilt once, and each is handed to Qt only when its content differs.
+    """
+
+    def __init__(self, tray):
+        super().__init__(tray)
+        self.tray = tray
+        self.entries = []
+        self.header = []          # QActions on top of the context menu
+        self.header_zones = []
+        self.header_texts = []
+        self.icon_key = None
+        self.tooltip = None
+        self.pending = False
+        self.font = QFont("DejaVu Sans", 26, QFont.Bold)
+
+    def add_entry(self, entry):
+        if entry not in self.entries:
+            self.entries.append(entry)
+            self.changed()
+
+    def remove_entry(self, entry):
+        if entry in self.entries:
+            self.entries.remove(entry)
+            self.changed()
+
+    def changed(self):
+        # Coalesce the changes of one tick into a single redraw
+        if not self.pending:
+            self.pending = True
+            QTimer.singleShot(0, self.flush)
+
+    def icon_entry(self):
+        chosen = self.tray.settings.get("tray_zone")
+        for entry in self.entries:
+            if entry.timezone == chosen:
+                return entry
+        return self.entries[0] if self.entries else None
+
+    def flush(self):
+        self.pending = False
+        self.update_icon()
+        self.update_tooltip()
+        self.update_header()
+
+    def update_icon(self):
+        entry = self.icon_entry()
+        if entry is None:
+            key = None
+        else:
+            theme = entry.theme
+            key = (entry.text, theme.color, theme.background.name(QColor.HexArgb) if theme.background else None)
+        if key == self.icon_key:
+            return
+        self.icon_key = key
+        self.tray.setIcon(self.tray.base_icon if entry is None else self.render_icon(entry))
+
+    def render_icon(self, entry):
+        pixmap = QPixmap(ICON_SIZE, ICON_SIZE)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setBrush(entry.theme.background or QColor("#c0202020"))
+        painter.setPen(Qt.NoPen)
+        painter.drawRoundedRect(0, 0, ICON_SIZE, ICON_SIZE, 10, 10)
+        painter.setPen(QColor(entry.theme.color))
+        painter.setFont(self.font)
+        # "12:34" is drawn on two lines, hours above minutes
+        text = entry.text.strip().replace(":", "\n", 1)
+        painter.drawText(QRect(0, 0, ICON_SIZE, ICON_SIZE), Qt.AlignCenter, text)
+        painter.end()
+        return QIcon(pixmap)
+
+    def update_tooltip(self):
+        rows = "".join(f"<tr><td>{html.escape(entry.label())}</td>"
+                       f"<td>&nbsp;&nbsp;<b>{html.escape(entry.text)}</b></td></tr>"
+                       for entry in self.entries)
+        tooltip = f"<table>{rows}</table>" if rows else ""
+        if tooltip != self.tooltip:
+            self.tooltip = tooltip
+            self.tray.setToolTip(tooltip)
+
+    def update_header(self):
+        menu = self.tray.contextMenu()
+        if menu is None:
+            return
+        zones = [entry.timezone for entry in self.entries]
+        texts = [f"{entry.text}    {entry.label()}" for entry in self.entries]
+        if zones != self.header_zones:
+            self.clear_header()
+            first = menu.actions()[0] if menu.actions() else None
+            for timezone in zones:
+                action = menu.addAction("")
+                action.triggered.connect(lambda checked, tz=timezone: self.tray.set_tray_zone(tz))
+                menu.insertAction(first, action)
+                self.header.append(action)
+            if zones:
+                self.header.append(menu.insertSeparator(first))
+            self.header_zones = zones
+        # Only the rows whose time changed
+        for n, text in enumerate(texts):
+            if n >= len(self.header_texts) or self.header_texts[n] != text:
+                self.header[n].setText(text)
+        self.header_texts = texts
+
+    def clear_header(self):
+        menu = self.tray.contextMenu()
+        for action in self.header:
+            if menu is not None:
+                menu.removeAction(action)
+            action.deleteLater()
+        self.header = []
+        self.header_zones = []
+        self.header_texts = []
+
+    def close(self):
+        self.clear_header()
+        self.tray.setIcon(self.tray.base_icon)
+        self.tray.setToolTip("")
+        self.entries = []
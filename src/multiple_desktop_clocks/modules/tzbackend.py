@@ -0,0 +1,284 @@
+import os
+import re
+import struct
+import sys
+from datetime import date, datetime
+
+EPOCH = datetime(1970, 1, 1)
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Transitions of the POSIX rule at the end of a TZif file are expanded up to this year
+LAST_YEAR = 2100
+
+# Where the system tzdata usually is, as in the TZPATH of the zoneinfo module
+ZONEINFO_PATHS = ("/usr/share/zoneinfo", "/usr/lib/zoneinfo", "/usr/share/lib/zoneinfo", "/etc/zoneinfo")
+
+
+class PytzBackend:
+    """Zone data bundled with pytz: the same everywhere, but only as new as the installed pytz."""
+
+    name = "pytz"
+
+    def __init__(self):
+        import pytz   # slow to import, so only when this backend is used
+        self.pytz = pytz
+
+    def names(self):
+        return self.pytz.all_timezones_set
+
+    def is_valid(self, name):
+        return name in self.pytz.all_timezones_set
+
+    def transitions(self, name):
+        """(transitions, offsets, abbrs) of a zone, see OffsetTable."""
+        tz = self.pytz.timezone(name)
+        if hasattr(tz, "_utc_transition_times"):
+            transitions = []
+            for when in tz._utc_transition_times:
+                if when.year <= 1:
+                    transitions.append(float("-inf"))
+                else:
+                    transitions.append(int((when - EPOCH).total_seconds()))
+            offsets = [int(info[0].total_seconds()) for info in tz._transition_info]
+            abbrs = [info[2] for info in tz._transition_info]
+            return transitions, offsets, abbrs
+        # StaticTzInfo and UTC: a single interval forever
+        offset = tz.utcoffset(datetime(2000, 1, 1))
+        return [float("-inf")], [int(offset.total_seconds())], [tz.tzname(None)]
+
+    def open_resource(self, name):
+        return self.pytz.open_resource(name)
+
+    def country_names(self):
+        return {code.upper(): country for code, country in self.pytz.country_names.items()}
+
+    def signature(self, name):
+        return None   # bundled data never changes while running
+
+    def refresh(self):
+        pass
+
+    def version(self):
+        return self.pytz.OLSON_VERSION
+
+
+class ZoneinfoBackend:
+    """The TZif files of the system tzdata, e.g. /usr/share/zoneinfo, updated with the OS."""
+
+    name = "zoneinfo"
+
+    def __init__(self, root):
+        self.root = root
+        self._names = None
+
+    def path(self, name):
+        return os.path.join(self.root, name)
+
+    def names(self):
+        if self._names is None:
+            self._names = frozenset(self.read_names()) - {"localtime", "posixrules", "Factory"}
+        return self._names
+
+    def read_names(self):
+        # tzdata.zi lists every zone ("Z name ...") and link ("L target name") in one small file
+        try:
+            with open(self.path("tzdata.zi"), "r", encoding="utf-8") as f:
+                names = []
+                for line in f:
+                    if line.startswith("Z "):
+                        names.append(line.split(None, 2)[1])
+                    elif line.startswith("L "):
+                        names.append(line.split()[2])
+                if names:
+                    return names
+        except OSError:
+            pass
+        # Otherwise every file that starts with the TZif magic
+        names = []
+        for directory, dirs, files in os.walk(self.root):
+            dirs[:] = [d for d in dirs if d not in ("posix", "right")]
+            for file in files:
+                path = os.path.join(directory, file)
+                try:
+                    with open(path, "rb") as f:
+                        if f.read(4) == b"TZif":
+                            names.append(os.path.relpath(path, self.root))
+                except OSError:
+                    pass
+        return names
+
+    def is_valid(self, name):
+        return name in self.names()
+
+    def transitions(self, name):
+        if not self.is_valid(name):
+            raise KeyError(f"Unknown time zone: {name}")
+        with open(self.path(name), "rb") as f:
+            return read_tzif(f.read())
+
+    def open_resource(self, name):
+        return open(self.path(name), "rb")
+
+    def country_names(self):
+        names = {}
+        with open(self.path("iso3166.tab"), "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.startswith("#") and "\t" in line:
+                    code, country = line.rstrip("\n").split("\t", 1)
+                    names[code.upper()] = country
+        return names
+
+    def signature(self, name):
+        """What changes when the file of the zone is replaced, or None if it is gone."""
+        try:
+            st = os.stat(self.path(name))
+        except OSError:
+            return None
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    def refresh(self):
+        # An update can add or remove zones
+        self._names = None
+
+    def version(self):
+        try:
+            with open(self.path("tzdata.zi"), "r", encoding="utf-8") as f:
+                first = f.readline()
+        except OSError:
+            return "unknown"
+        return first[len("# version "):].strip() if first.startswith("# version ") else "unknown"
+
+
+# ======== TZif files (RFC 8536) ========
+
+_HEADER = struct.Struct(">4sc15x6l")
+
+def _read_block(data, pos, time_size):
+    _, _, isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = _HEADER.unpack_from(data, pos)
+    pos += _HEADER.size
+    times = struct.unpack_from(">%d%s" % (timecnt, "q" if time_size == 8 else "l"), data, pos)
+    pos += timecnt * time_size
+    indices = data[pos:pos + timecnt]
+    pos += timecnt
+    types = [struct.unpack_from(">lBB", data, pos + 6 * i) for i in range(typecnt)]
+    pos += 6 * typecnt
+    chars = data[pos:pos + charcnt]
+    pos += charcnt + leapcnt * (time_size + 4) + isstdcnt + isutcnt
+    return times, indices, types, chars, pos
+
+def read_tzif(data):
+    """(transitions, offsets, abbrs) of a TZif file, the POSIX rule of its footer included."""
+    if data[:4] != b"TZif":
+        raise ValueError("Not a TZif file")
+    times, indices, types, chars, pos = _read_block(data, 0, 4)
+    footer = ""
+    if data[4:5] >= b"2":
+        # Version 2+ repeats the data with 64-bit times, then the POSIX TZ string
+        times, indices, types, chars, pos = _read_block(data, pos, 8)
+        end = data.find(b"\n", pos + 1)
+        if end > pos:
+            footer = data[pos + 1:end].decode("ascii")
+
+    def abbr(i):
+        return chars[i:chars.index(b"\0", i)].decode("ascii")
+
+    # Before the first transition the zone is in its first type
+    transitions = [float("-inf")] + list(times)
+    offsets = [types[0][0]] + [types[i][0] for i in indices]
+    abbrs = [abbr(types[0][2])] + [abbr(types[i][2]) for i in indices]
+    if footer:
+        extend_with_rule(transitions, offsets, abbrs, parse_posix_tz(footer))
+    return transitions, offsets, abbrs
+
+def extend_with_rule(transitions, offsets, abbrs, rule):
+    # Slim TZif files stop where the rule starts repeating: expand it up to LAST_YEAR
+    std_abbr, std_offset, dst_abbr, dst_offset, start, end = rule
+    last = transitions[-1]
+    if dst_abbr is None:
+        if (offsets[-1], abbrs[-1]) != (std_offset, std_abbr) and last != float("-inf"):
+            transitions.append(last + 1)
+            offsets.append(std_offset)
+            abbrs.append(std_abbr)
+        return
+    first_year = 1970 if last == float("-inf") else date.fromordinal(EPOCH_ORDINAL + int(last) // 86400).year
+    for year in range(first_year, LAST_YEAR + 1):
+        changes = sorted([
+            (rule_day(year, start[0]) * 86400 + start[1] - std_offset, dst_offset, dst_abbr),
+            (rule_day(year, end[0]) * 86400 + end[1] - dst_offset, std_offset, std_abbr),
+        ])
+        for when, offset, name in changes:
+            if when > transitions[-1] and (offset, name) != (offsets[-1], abbrs[-1]):
+                transitions.append(when)
+                offsets.append(offset)
+                abbrs.append(name)
+
+
+# ======== POSIX TZ strings, e.g. "CET-1CEST,M3.5.0,M10.5.0/3" ========
+
+_NAME = r"(<[^>]+>|[A-Za-z]{3,})"
+_OFFSET = r"([+-]?\d{1,3}(?::\d{1,2}){0,2})"
+_POSIX_TZ = re.compile(rf"^{_NAME}{_OFFSET}(?:{_NAME}{_OFFSET}?(?:,([^,]+),([^,]+))?)?$")
+
+def _seconds(text):
+    sign = -1 if text.startswith("-") else 1
+    parts = [int(part) for part in text.lstrip("+-").split(":")]
+    parts += [0] * (3 - len(parts))
+    return sign * (parts[0] * 3600 + parts[1] * 60 + parts[2])
+
+def _rule(text):
+    # (date rule, seconds after local midnight); the time defaults to 02:00
+    day, _, when = text.partition("/")
+    return day, _seconds(when) if when else 7200
+
+def parse_posix_tz(text):
+    """(std_abbr, std_offset, dst_abbr, dst_offset, start, end) with offsets in seconds east of UTC."""
+    match = _POSIX_TZ.match(text)
+    if match is None:
+        raise ValueError(f"Invalid POSIX TZ string: {text!r}")
+    std, std_off, dst, dst_off, start, end = match.groups()
+    # POSIX offsets are west of UTC
+    std_offset = -_seconds(std_off)
+    if dst is None:
+        return std.strip("<>"), std_offset, None, None, None, None
+    dst_offset = -_seconds(dst_off) if dst_off else std_offset + 3600
+    if start is None:
+        start, end = "M3.2.0", "M11.1.0"   # the POSIX default, US rules
+    return std.strip("<>"), std_offset, dst.strip("<>"), dst_offset, _rule(start), _rule(end)
+
+def rule_day(year, rule):
+    """Days since the epoch of a POSIX date rule: Mm.w.d, Jn (no Feb 29) or n (from 0)."""
+    if rule.startswith("M"):
+        month, week, weekday = (int(part) for part in rule[1:].split("."))
+        first = date(year, month, 1)
+        # weekday: 0 is Sunday; week 5 is the last one of the month
+        day = 1 + (weekday - (first.weekday() + 1)) % 7 + (week - 1) * 7
+        next_month = date(year + month // 12, month % 12 + 1, 1)
+        while day > (next_month - first).days:
+            day -= 7
+        return first.toordinal() + day - 1 - EPOCH_ORDINAL
+    jan1 = date(year, 1, 1).toordinal() - EPOCH_ORDINAL
+    if rule.startswith("J"):
+        n = int(rule[1:])
+        leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+        return jan1 + n - 1 + (1 if leap and n >= 60 else 0)
+    return jan1 + int(rule)
+
+
+def find_zoneinfo_root():
+    for root in [os.environ.get("TZDIR")] + list(ZONEINFO_PATHS):
+        if root and os.path.isfile(os.path.join(root, "UTC")):
+            return root
+    return None
+
+def backend_from_settings(settings):
+    """settings["tz_backend"]: "zoneinfo" (system tzdata), "pytz" (bundled) or "auto" (the default)."""
+    kind = settings.get("tz_backend", "auto")
+    if kind in ("auto", "zoneinfo"):
+        root = settings.get("zoneinfo_path") or find_zoneinfo_root()
+        if root and os.path.isdir(root):
+            return ZoneinfoBackend(root)
+        if kind == "zoneinfo":
+            print("No system tzdata found, using pytz", file=sys.stderr)
+    elif kind != "pytz":
+        print(f"Unknown time zone backend: {kind}", file=sys.stderr)
+    return PytzBackend()
@@ -0,0 +1,131 @@
+import sys
+from bisect import bisect_right
+
+from multiple_desktop_clocks.modules.timesource import get_time_source
+from multiple_desktop_clocks.modules.tzbackend  import backend_from_settings
+
+
+class OffsetTable:
+    """UTC-offset transitions of one zone, as epoch seconds, built once."""
+
+    def __init__(self, name, transitions, offsets, abbrs):
+        self.name = name
+        self.transitions = transitions  # sorted epoch seconds (UTC)
+        self.offsets = offsets          # offset in seconds from each transition on
+        self.abbrs = abbrs
+
+    def index(self, t):
+        return max(bisect_right(self.transitions, t) - 1, 0)
+
+    def interval(self, t):
+        """Return (offset, abbr, since, until) valid for the UTC instant t."""
+        i = self.index(t)
+        since = self.transitions[i] if self.transitions else float("-inf")
+        until = self.transitions[i + 1] if i + 1 < len(self.transitions) else float("inf")
+        return self.offsets[i], self.abbrs[i], since, until
+
+
+class ZoneClock:
+    """Current offset of one zone, cached until its next transition instant."""
+
+    __slots__ = ("table", "offset", "abbr", "since", "until")
+
+    def __init__(self, table):
+        self.table = table
+        self.since = self.until = 0
+        self.refresh(get_time_source().now())
+
+    def refresh(self, now):
+        self.offset, self.abbr, self.since, self.until = self.table.interval(now)
+
+    def set_table(self, table):
+        # New data for the zone: the clocks holding this object see it on their next tick
+        self.table = table
+        self.refresh(get_time_source().now())
+
+    def local_seconds(self, now=None):
+        if now is None:
+            now = get_time_source().now()
+        if not (self.since <= now < self.until):
+            self.refresh(now)
+        return int(now) + self.offset
+
+    def hms(self, now=None):
+        m, s = divmod(self.local_seconds(now) % 86400, 60)
+        h, m = divmod(m, 60)
+        return h, m, s
+
+
+class TimezoneEngine:
+    """Builds the offset table of each zone once and shares it between clocks.
+
+    The data comes from a backend of modules/tzbackend.py: the system tzdata
+    (zoneinfo) when there is one, pytz otherwise.
+    """
+
+    def __init__(self, backend=None):
+        self._backend = backend
+        self.tables = {}
+        self.zones = {}
+        self.signatures = {}   # name -> signature of its data when the table was built
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = backend_from_settings({})
+        return self._backend
+
+    def set_backend(self, backend):
+        self._backend = backend
+        self.reload(list(self.tables))
+
+    def build_table(self, name):
+        self.signatures[name] = self.backend.signature(name)
+        return OffsetTable(name, *self.backend.transitions(name))
+
+    def table(self, name):
+        table = self.tables.get(name)
+        if table is None:
+            table = self.tables[name] = self.build_table(name)
+        return table
+
+    def reload(self, names):
+        """Build the tables of `names` again, e.g. after a tzdata update."""
+        for name in names:
+            try:
+                table = self.build_table(name)
+            except (OSError, KeyError, ValueError) as e:
+                print(f"{name}: {e}", file=sys.stderr)   # keep the old data
+                continue
+            self.tables[name] = table
+            zone = self.zones.get(name)
+            if zone is not None:
+                zone.set_table(table)
+
+    def changed_zones(self):
+        """Zones whose data changed on disk since their table was built."""
+        backend = self.backend
+        return [name for name, signature in self.signatures.items()
+                if signature is not None and backend.signature(name) != signature]
+
+    def reload_changed(self):
+        changed = self.changed_zones()
+        if changed:
+            self.backend.refresh()
+            self.reload(changed)
+        return changed
+
+    def zone(self, name):
+        zone = self.zones.get(name)
+        if zone is None:
+            zone = self.zones[name] = ZoneClock(self.table(name))
+        return zone
+
+
+_engine = None
+
+def get_engine():
+    global _engine
+    if _engine is None:
+        _engine = TimezoneEngine()
+    return _engine
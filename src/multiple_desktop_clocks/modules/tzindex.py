@@ -0,0 +1,240 @@
+import re
+from bisect import bisect_left
+
+from multiple_desktop_clocks.modules.timesource import get_time_source
+from multiple_desktop_clocks.modules.tzengine import OffsetTable, get_engine
+
+SPLIT = re.compile(r"[\s/_,\-()]+")
+# "+1", "-03:00", "utc+5:30": searched in the offsets, never in the names
+OFFSET_TERM = re.compile(r"^(utc|gmt)?[+-]\d")
+OFFSET = re.compile(r"^(?:utc|gmt)?([+-])(\d{1,2})(?::?(\d{2}))?$")
+
+
+def format_offset(seconds):
+    sign = "+" if seconds >= 0 else "-"
+    h, m = divmod(abs(seconds) // 60, 60)
+    return f"UTC{sign}{h:02d}:{m:02d}"
+
+def offset_key(term):
+    """"+1", "-0300", "utc+5:30" -> "utc+01:00", "utc-03:00", "utc+05:30"; None if incomplete."""
+    match = OFFSET.match(term)
+    if match is None:
+        return None
+    sign, h, m = match.group(1), int(match.group(2)), int(match.group(3) or 0)
+    if h > 14 or m >= 60:
+        return None
+    return f"utc{sign}{h:02d}:{m:02d}"
+
+def words(text):
+    return [w for w in SPLIT.split(text.lower()) if w]
+
+
+def read_zone_countries():
+    """Map each zone of zone1970.tab to the names of the countries it covers.
+
+    Without the file (some tzdata packages leave it out) the zones are only
+    searched by name.
+    """
+    countries = {}
+    backend = get_engine().backend
+    try:
+        country_names = backend.country_names()
+        with backend.open_resource("zone1970.tab") as f:
+            lines = f.read().decode("utf-8").splitlines()
+    except (OSError, KeyError):   # pytz raises UnknownTimeZoneError, a KeyError
+        return countries
+    for line in lines:
+        if line.startswith("#") or not line.strip():
+            continue
+        fields = line.split("\t")
+        if len(fields) < 3:
+            continue
+        names = [country_names.get(code.upper(), code) for code in fields[0].split(",")]
+        countries[fields[2]] = names
+    return countries
+
+
+class ZoneEntry:
+    __slots__ = ("name", "city", "countries", "abbr", "offset", "since", "until", "haystack")
+
+    def __init__(self, name, countries):
+        self.name = name
+        self.city = name.rsplit("/", 1)[-1].replace("_", " ")
+        self.countries = countries
+        self.abbr = ""
+        self.offset = 0
+        self.since = self.until = 0   # abbr and offset are unknown until first shown
+        self.haystack = " ".join([name, self.city] + countries).lower()
+
+    def current(self, now=None):
+        """(abbr, offset) at `now`, read again only after the next transition."""
+        if now is None:
+            now = get_time_source().now()
+        if not (self.since <= now < self.until):
+            engine = get_engine()
+            # Not through engine.zone(): the engine reloads and watches every zone it holds
+            table = engine.tables.get(self.name)
+            if table is None:
+                table = OffsetTable(self.name, *engine.backend.transitions(self.name))
+            self.offset, self.abbr, self.since, self.until = table.interval(now)
+        return self.abbr, self.offset
+
+    def display(self):
+        abbr, offset = self.current()
+        where = self.city
+        if self.countries:
+            where += ", " + ", ".join(self.countries)
+        return f"{self.name}    {where}    {abbr} {format_offset(offset)}"
+
+
+class TimezoneIndex:
+    """Prefix and fuzzy search over zone name, city, country, abbreviation and offset.
+
+    The names and countries are indexed when the index is built. The
+    abbreviations and offsets are read from every zone on the first search
+    that needs them, or ahead of it with dynamic_keys() while idle, and again
+    after the next transition of any zone. Terms that look like an offset
+    match the offset exactly; other terms match names, countries and
+    abbreviations by prefix.
+    """
+
+    def __init__(self, names=None):
+        if names is None:
+            names = sorted(get_engine().backend.names())
+        zone_countries = read_zone_countries()
+        self.entries = [ZoneEntry(name, zone_countries.get(name, [])) for name in names]
+
+        # Static keys are built once; abbreviations and offsets change with DST
+        static = []
+        for i, entry in enumerate(self.entries):
+            keys = set(words(entry.name)) | set(words(entry.city)) | {entry.name.lower()}
+            for country in entry.countries:
+                keys.update(words(country))
+                keys.add(country.lower())
+            static.extend((key, i) for key in keys)
+        static.sort()
+        self.static_keys = [key for key, _ in static]
+        self.static_ids = [i for _, i in static]
+
+        self.abbr_keys = self.abbr_ids = self.offset_ids = None
+        self.dynamic_since = self.dynamic_until = 0
+
+        self.last_query = None
+        self.last_results = None
+        self.last_exact = False
+        self.last_time = 0
+
+    @staticmethod
+    def prefix_ids(keys, ids, prefix, found):
+        pos = bisect_left(keys, prefix)
+        while pos < len(keys) and keys[pos].startswith(prefix):
+            found.add(ids[pos])
+            pos += 1
+
+    def dynamic_keys(self, now=None):
+        """Build the abbreviation and offset keys, valid until the next transition of any zone."""
+        if now is None:
+            now = get_time_source().now()
+        if self.abbr_keys is None or not (self.dynamic_since <= now < self.dynamic_until):
+            abbrs = []
+            self.offset_ids = {}
+            for i, entry in enumerate(self.entries):
+                abbr, offset = entry.current(now)
+                # Numeric abbreviations such as "+03" are found as offsets
+                if abbr and abbr[0] not in "+-":
+                    abbrs.append((abbr.lower(), i))
+                self.offset_ids.setdefault(format_offset(offset).lower(), set()).add(i)
+            abbrs.sort()
+            self.abbr_keys = [key for key, _ in abbrs]
+            self.abbr_ids = [i for _, i in abbrs]
+            self.dynamic_since = max((entry.since for entry in self.entries), default=float("-inf"))
+            self.dynamic_until = min((entry.until for entry in self.entries), default=float("inf"))
+
+    def term_ids(self, term):
+        """(ids matching term, ids matching it by name or country)."""
+        if OFFSET_TERM.match(term):
+            key = offset_key(term)
+            return set(self.offset_ids.get(key, ())) if key else set(), set()
+        named = set()
+        self.prefix_ids(self.static_keys, self.static_ids, term, named)
+        found = set(named)
+        self.prefix_ids(self.abbr_keys, self.abbr_ids, term, found)
+        return found, named
+
+    def entry_matches(self, entry, terms):
+        keys = self.entry_keys(entry)
+        return all(any(key.startswith(term) for key in keys) for term in terms)
+
+    def entry_keys(self, entry):
+        keys = words(entry.name) + words(entry.city) + [entry.name.lower(), entry.abbr.lower()]
+        for country in entry.countries:
+            keys += words(country) + [country.lower()]
+        return keys
+
+    @staticmethod
+    def fuzzy_score(query, text):
+        """Characters of query in order inside text; lower is better, None if absent."""
+        score = 0
+        pos = -1
+        for ch in query:
+            found = text.find(ch, pos + 1)
+            if found < 0:
+                return None
+            score += found - pos - 1
+            pos = found
+        return score
+
+    def search(self, query):
+        """Return the list of matching ZoneEntry objects, best first."""
+        query = query.strip().lower()
+        if not query:
+            return list(self.entries)
+        terms = query.split()
+        now = get_time_source().now()
+        self.dynamic_keys(now)
+        # Offsets match exactly, so only prefix terms narrow as more is typed
+        prefix_only = not any(OFFSET_TERM.match(term) for term in terms)
+
+        # Typing one more character can only narrow results found by key
+        last = self.last_query
+        results = None
+        if (last and query.startswith(last) and self.last_results is not None and self.last_exact
+                and prefix_only and self.dynamic_since <= self.last_time <= now):
+            results = [e for e in self.last_results if self.entry_matches(e, terms)]
+        if not results:
+            ids = named = None
+            for term in terms:
+                found, found_named = self.term_ids(term)
+                ids = found if ids is None else ids & found
+                named = found_named if named is None else named & found_named
+                if not ids:
+                    break
+            # Cities starting with the query first, then the other name or country matches,
+            # then the zones found by abbreviation or offset
+            first = terms[0]
+            ranked = sorted(ids or (), key=lambda i: (not self.entries[i].city.lower().startswith(first),
+                                                      i not in named, i))
+            results = [self.entries[i] for i in ranked]
+        exact = bool(results) and prefix_only
+
+        if not results:
+            compact = query.replace(" ", "")
+            scored = []
+            for entry in self.entries:
+                score = self.fuzzy_score(compact, entry.haystack)
+                if score is not None:
+                    scored.append((score, entry.name, entry))
+            scored.sort(key=lambda item: (item[0], item[1]))
+            results = [entry for _, _, entry in scored]
+
+        self.last_query, self.last_results, self.last_exact, self.last_time = query, results, exact, now
+        return results
+
+
+_index = None
+
+def get_timezone_index():
+    global _index
+    if _index is None:
+        _index = TimezoneIndex()
+    return _index
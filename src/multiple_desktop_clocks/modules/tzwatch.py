@@ -0,0 +1,75 @@
+import os
+
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+
+class TzdataWatcher(QObject):
+    """Emits zonesChanged(names) after the system tzdata of zones in use was updated.
+
+    Only the zones whose files changed are rebuilt by the engine. A package
+    update replaces many files in a row, hence the longer debounce.
+    """
+
+    zonesChanged = pyqtSignal(list)
+
+    def __init__(self, engine, delay_ms=1000, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.names = []
+        self.backend = None
+        self.paths = {}   # zone -> (path, real path) of its file
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.on_event)
+        self.watcher.directoryChanged.connect(self.on_event)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.reload)
+
+    def watch(self, names=None):
+        """Watch the files of `names` (the zones of the clocks) and the directories they are in.
+
+        Only the paths that differ from the ones already watched are added or removed.
+        """
+        if names is not None:
+            self.names = list(names)
+        backend = self.engine.backend
+        if not hasattr(backend, "path"):   # pytz: bundled data
+            self.set_paths(set(), set())
+            return
+        if backend is not self.backend:
+            self.backend = backend
+            self.paths = {}
+        files, directories = set(), {backend.root}
+        for name in self.names:
+            paths = self.paths.get(name)
+            if paths is None:
+                path = backend.path(name)
+                # Links such as US/Eastern: the file they point to is the one replaced
+                paths = self.paths[name] = (path, os.path.realpath(path))
+            files.update(paths)
+            directories.add(os.path.dirname(paths[1]))
+        self.set_paths(files, directories)
+
+    def set_paths(self, files, directories):
+        watched_files, watched_directories = set(self.watcher.files()), set(self.watcher.directories())
+        stale = list(watched_files - files) + list(watched_directories - directories)
+        if stale:
+            self.watcher.removePaths(stale)
+        # An atomic replace drops the file from the watch list, so it is added again
+        new = [path for path in files - watched_files if os.path.exists(path)]
+        new += list(directories - watched_directories)
+        if new:
+            self.watcher.addPaths(new)
+
+    def on_event(self, path):
+        self.timer.start()
+
+    def reload(self):
+        changed = self.engine.reload_changed()
+        self.paths = {}   # an update can also change where a link points
+        self.watch()
+        if changed:
+            self.zonesChanged.emit(changed)
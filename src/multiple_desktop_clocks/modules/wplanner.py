@@ -0,0 +1,147 @@
+import numpy as np
+
+from PyQt5.QtWidgets import (QComboBox, QDialog, QHBoxLayout, QLabel, QScrollArea, QSpinBox,
+                             QToolTip, QVBoxLayout, QWidget)
+from PyQt5.QtGui import QColor, QFont, QImage, QPainter
+from PyQt5.QtCore import Qt, QRect, QTimer
+
+from multiple_desktop_clocks.modules.planner import BUSINESS, NIGHT, OFF_HOURS, PlannerGrid
+from multiple_desktop_clocks.modules.timesource import get_time_source
+
+SLOT_SIZES = {"1 hour": 3600, "30 minutes": 1800, "15 minutes": 900}
+
+# ARGB of each cell kind, indexed by PlannerGrid.kind
+PALETTE = np.zeros(3, dtype=np.uint32)
+PALETTE[NIGHT] = 0xFF2B3A55
+PALETTE[OFF_HOURS] = 0xFF8FA3BF
+PALETTE[BUSINESS] = 0xFF7CC576
+DST_COLOR = 0xFFE0A030
+OVERLAP_COLOR = QColor("#2E8B57")
+
+
+class PlannerView(QWidget):
+    """Draws the whole grid as one image built from the kind array."""
+
+    ROW_HEIGHT = 22
+    HEADER = 22
+    LABEL_WIDTH = 180
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.grid = None
+        self.image = None
+        self.cell_width = 12
+        self.setMouseTracking(True)
+        self.setFont(QFont('DejaVu Sans', 8))
+
+    def set_grid(self, grid, cell_width):
+        self.grid = grid
+        self.cell_width = cell_width
+        pixels = PALETTE[grid.kind]
+        pixels[grid.dst_change] = DST_COLOR
+        self.pixels = np.ascontiguousarray(pixels)
+        rows, columns = self.pixels.shape
+        self.image = QImage(self.pixels.data, columns, rows, columns * 4, QImage.Format_ARGB32)
+        self.setMinimumSize(self.LABEL_WIDTH + columns * cell_width,
+                            self.HEADER * 2 + rows * self.ROW_HEIGHT)
+        self.update()
+
+    def cell_at(self, pos):
+        if self.grid is None:
+            return None
+        column = (pos.x() - self.LABEL_WIDTH) // self.cell_width
+        row = (pos.y() - self.HEADER) // self.ROW_HEIGHT
+        if 0 <= row < len(self.grid.zones) and 0 <= column < len(self.grid.times):
+            return row, column
+        return None
+
+    def mouseMoveEvent(self, event):
+        cell = self.cell_at(event.pos())
+        if cell is None:
+            QToolTip.hideText()
+            return
+        column = cell[1]
+        lines = [f"{zone}: {self.grid.local_text(row, column)}" for row, zone in enumerate(self.grid.zones)]
+        QToolTip.showText(event.globalPos(), "\n".join(lines), self)
+
+    def paintEvent(self, event):
+        if self.grid is None:
+            return
+        painter = QPainter(self)
+        rows, columns = self.pixels.shape
+        width = columns * self.cell_width
+        left, top = self.LABEL_WIDTH, self.HEADER
+
+        # One scaled image for every cell
+        painter.drawImage(QRect(left, top, width, rows * self.ROW_HEIGHT), self.image)
+
+        # Hour marks of UTC on top, zone names on the left
+        painter.setPen(Qt.black)
+        painter.drawText(4, top - 6, "UTC hour")
+        step = max(1, 3600 // self.grid.slot_seconds) * max(1, 48 // self.cell_width)
+        for column in range(0, columns, step):
+            hour = int(self.grid.times[column]) // 3600 % 24
+            painter.drawText(left + column * self.cell_width + 2, top - 6, f"{hour:02d}")
+        for row, zone in enumerate(self.grid.zones):
+            painter.drawText(QRect(4, top + row * self.ROW_HEIGHT, left - 8, self.ROW_HEIGHT),
+                             Qt.AlignVCenter | Qt.AlignLeft, zone)
+
+        # Slots that are business hours everywhere
+        y = top + rows * self.ROW_HEIGHT + 4
+        painter.drawText(QRect(4, y, left - 8, self.HEADER - 6), Qt.AlignVCenter | Qt.AlignLeft, "Overlap")
+        for column in np.flatnonzero(self.grid.overlap):
+            painter.fillRect(left + int(column) * self.cell_width, y, self.cell_width, self.HEADER - 6,
+                             OVERLAP_COLOR)
+        painter.end()
+
+
+class PlannerWindow(QDialog):
+    """Business hours, nights and UTC offset changes of every clock over the next days"""
+    def __init__(self, zones, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Meeting planner")
+        self.resize(900, 420)
+        self.zones = list(zones)
+
+        layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Slot:"))
+        self.slot = QComboBox()
+        self.slot.addItems(list(SLOT_SIZES))
+        self.slot.currentIndexChanged.connect(self.refresh)
+        controls.addWidget(self.slot)
+        controls.addWidget(QLabel("Days:"))
+        self.days = QSpinBox()
+        self.days.setRange(1, 14)
+        self.days.setValue(3)
+        self.days.valueChanged.connect(self.refresh)
+        controls.addWidget(self.days)
+        controls.addStretch()
+        controls.addWidget(QLabel("green: business hours   blue: night   orange: UTC offset change"))
+        layout.addLayout(controls)
+
+        self.view = PlannerView()
+        scroll = QScrollArea()
+        scroll.setWidget(self.view)
+        scroll.setWidgetResizable(True)
+        layout.addWidget(scroll)
+
+        # The first column follows the clock
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(60 * 1000)
+
+    def set_zones(self, zones):
+        self.zones = list(zones)
+        if self.isVisible():
+            self.refresh()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+
+    def refresh(self):
+        slot_seconds = SLOT_SIZES[self.slot.currentText()]
+        slots = self.days.value() * 86400 // slot_seconds
+        grid = PlannerGrid(self.zones, get_time_source().now(), slots, slot_seconds)
+        self.view.set_grid(grid, max(4, 48 * slot_seconds // 3600 // 4))
@@ -0,0 +1,40 @@
+import json
+
+from PyQt5.QtWidgets import QDialog, QPlainTextEdit, QPushButton, QVBoxLayout
+from PyQt5.QtGui import QFont
+from PyQt5.QtCore import QTimer
+
+
+class StatsWindow(QDialog):
+    """Runtime metrics of the clocks, refreshed every second"""
+    def __init__(self, metrics, parent=None):
+        super().__init__(parent)
+        self.metrics = metrics
+        self.setWindowTitle("Statistics")
+        self.setMinimumSize(500, 600)
+
+        layout = QVBoxLayout(self)
+
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setFont(QFont('DejaVu Sans Mono', 9))
+        layout.addWidget(self.text)
+
+        # OK Button
+        ok_button = QPushButton("OK")
+        ok_button.clicked.connect(self.accept)
+        layout.addWidget(ok_button)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(1000)
+        self.refresh()
+
+    def refresh(self):
+        scroll = self.text.verticalScrollBar().value()
+        self.text.setPlainText(json.dumps(self.metrics.snapshot(), indent=2))
+        self.text.verticalScrollBar().setValue(scroll)
+
+def show_stats_window(metrics):
+    dialog = StatsWindow(metrics)
+    dialog.exec_()
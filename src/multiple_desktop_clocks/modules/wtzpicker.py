@@ -0,0 +1,99 @@
+import time
+
+from PyQt5.QtWidgets import (QDialog, QDialogButtonBox, QLabel, QLineEdit, QListView,
+                             QVBoxLayout)
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+
+from multiple_desktop_clocks.modules.tzindex import get_timezone_index
+
+
+class TimezoneModel(QAbstractListModel):
+    """Search results, handed to the view in batches as it scrolls"""
+    BATCH = 50
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.results = []
+        self.loaded = 0
+
+    def set_results(self, results):
+        self.beginResetModel()
+        self.results = results
+        self.loaded = min(self.BATCH, len(results))
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self.loaded < len(self.results)
+
+    def fetchMore(self, parent):
+        count = min(self.BATCH, len(self.results) - self.loaded)
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self.loaded:
+            return None
+        entry = self.results[index.row()]
+        if role == Qt.DisplayRole:
+            return entry.display()
+        if role == Qt.UserRole:
+            return entry.name
+        return None
+
+
+class TimezonePicker(QDialog):
+    """Time zone chooser with search as you type"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Add time zone")
+        self.setMinimumSize(560, 420)
+        self.index = get_timezone_index()
+
+        layout = QVBoxLayout(self)
+
+        layout.addWidget(QLabel("Search by zone, city, country, abbreviation or UTC offset:"))
+        self.search = QLineEdit()
+        self.search.setClearButtonEnabled(True)
+        self.search.textChanged.connect(self.update_results)
+        layout.addWidget(self.search)
+
+        self.model = TimezoneModel(self)
+        self.view = QListView()
+        self.view.setUniformItemSizes(True)
+        self.view.setModel(self.model)
+        self.view.doubleClicked.connect(self.accept)
+        layout.addWidget(self.view)
+
+        self.status = QLabel()
+        layout.addWidget(self.status)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        self.search.returnPressed.connect(self.accept)
+        self.update_results("")
+
+    def update_results(self, text):
+        start = time.perf_counter()
+        results = self.index.search(text)
+        self.model.set_results(results)
+        if results:
+            self.view.setCurrentIndex(self.model.index(0))
+        elapsed = (time.perf_counter() - start) * 1000
+        self.status.setText(f"{len(results)} time zones ({elapsed:.1f} ms)")
+
+    def selected(self):
+        index = self.view.currentIndex()
+        return index.data(Qt.UserRole) if index.isValid() else None
+
+def get_timezone(parent=None):
+    dialog = TimezonePicker(parent)
+    ok = dialog.exec_() == QDialog.Accepted
+    timezone = dialog.selected()
+    return timezone, ok and timezone is not None
@@ -1,217 +1,102 @@
-import sys, os, json, signal
-from PyQt5.QtCore import Qt, QTimer, QPoint, QRectF
-from PyQt5.QtWidgets import (QApplication, QLabel, QWidget, QSystemTrayIcon,
-                             QMenu, QInputDialog)
-from PyQt5.QtGui import QFont, QPainterPath, QRegion, QIcon, QFontMetrics
-import pytz
-from datetime import datetime
+import sys, os, signal
 
+from multiple_desktop_clocks.modules.startup import StartupProfiler
 import multiple_desktop_clocks.about as about
-from multiple_desktop_clocks.modules.configure import load_config, save_config
-from multiple_desktop_clocks.modules.wabout  import show_about_window
-from multiple_desktop_clocks.desktop import create_desktop_file, create_desktop_directory, create_desktop_menu
-
-CONFIG_PATH = os.path.join(os.path.expanduser("~"),".config",about.__package__,"config.json")
-
-
-# ======== Classe da janela do relógio ========
-
-class StickyClock(QWidget):
-    def __init__(self, timezone):
-        super().__init__()
-        self.timezone = timezone
-        
-        self.setWindowFlags(
-            Qt.FramelessWindowHint |
-            Qt.Tool
-        )
-        
-        self.setAttribute(Qt.WA_TranslucentBackground)
-
-        self.HEIGHT = 80
-        self.FONTSIZE = 24
-        self.COLOR = "white"
-
-        self.RADIUS = 20
-        self.resize(250, self.HEIGHT)
-        self.move(200, 200)
-
-        self.label = QLabel(self)
-        self.label.setStyleSheet(f"color: {self.COLOR};")
-        font = QFont('DejaVu Sans Mono', self.FONTSIZE, QFont.Bold)
-        self.label.setFont(font)
-        self.label.setAlignment(Qt.AlignVCenter | Qt.AlignLeft)
-        self.label.setGeometry(0, 0, 250, self.HEIGHT)
-
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_time)
-        self.timer.start(1000)
-        self.update_time()
-
-        self.old_pos = None
-        self.set_rounded_corners(self.RADIUS)
-
-    def set_rounded_corners(self, radius):
-        path = QPainterPath()
-        rect = QRectF(self.rect())
-        path.addRoundedRect(rect, radius, radius)
-        region = QRegion(path.toFillPolygon().toPolygon())
-        self.setMask(region)
-
-    def update_time(self):
-        tz = pytz.timezone(self.timezone)
-        now = datetime.now(tz)
-        time_str = now.strftime("%H:%M:%S") + " " + self.timezone
-        self.label.setText(time_str)
-
-        metrics = QFontMetrics(self.label.font())
-        text_width = metrics.horizontalAdvance(time_str) + 20
-        self.resize(text_width, self.HEIGHT)
-        self.label.setGeometry(0, 0, text_width, self.HEIGHT)
-        self.set_rounded_corners(self.RADIUS)
-
-    # Mover a janela com o mouse
-    def mousePressEvent(self, event):
-        if event.button() == Qt.LeftButton:
-            self.old_pos = event.globalPos()
-
-    def mouseMoveEvent(self, event):
-        if self.old_pos is not None:
-            delta = QPoint(event.globalPos() - self.old_pos)
-            self.move(self.x() + delta.x(), self.y() + delta.y())
-            self.old_pos = event.globalPos()
-
-    def mouseReleaseEvent(self, event):
-        self.old_pos = None
-        if hasattr(self, "tray_ref"):   # se o relógio conhece o tray
-            self.tray_ref.save_all_positions()
-
-# ======== Tray com múltiplos relógios ========
-
-class ClockIndicator(QSystemTrayIcon):
-    def __init__(self, icon, parent=None):
-        super().__init__(icon, parent)
-
-        self.clocks = {}  # timezone -> StickyClock
-
-        # Carregar fusos do JSON
-        self.config = load_config(CONFIG_PATH)
-        for tz, pos in self.config.items():
-            x = pos.get("x", 200)
-            y = pos.get("y", 200)
-            self.add_clock(tz, x, y)
-
-
-        menu = QMenu(parent)
-        
-        # Add
-        add_action = menu.addAction("➕ Add time zone")
-        add_action.triggered.connect(self.add_timezone)
-        
-        # Remove
-        remove_action = menu.addAction("➖ Remove time zone")
-        remove_action.triggered.connect(self.remove_timezone)
-        
-        #
-        menu.addSeparator()
-        
-        # About
-        about_action = menu.addAction("ℹ️ About")
-        about_action.triggered.connect(self.show_about)
-        
-        # Exit
-        exit_action = menu.addAction("❌ Exit")
-        exit_action.triggered.connect(self.exit_app)
-        
-        self.setContextMenu(menu)
-
-        self.show()
-
-    def add_clock(self, timezone, x=200, y=200):
-        if timezone in self.clocks:
-            return
-        clock = StickyClock(timezone)
-        clock.move(x, y)
-        clock.tray_ref = self   # <<< adiciona referência ao tray
-        clock.show()
-        self.clocks[timezone] = clock
-        self.save_all_positions()
-
-    def save_all_positions(self):
-        data = {}
-        for tz, clock in self.clocks.items():
-            data[tz] = {"x": clock.x(), "y": clock.y()}
-        save_config(CONFIG_PATH, data)
-
-
-    def add_timezone(self):
-        tz_list = pytz.all_timezones
-        tz, ok = QInputDialog.getItem(None, "Add time zone",
-                                      "Choose a timezone:", tz_list, 0, False)
-        if ok and tz:
-            self.add_clock(tz)
-
-    def remove_timezone(self):
-        if not self.clocks:
-            return
-        tz_list = list(self.clocks.keys())
-        tz, ok = QInputDialog.getItem(None, "Remove time zone",
-                                      "Choose a timezone to remove:", tz_list, 0, False)
-        if ok and tz:
-            self.clocks[tz].close()
-            del self.clocks[tz]
-            save_config(CONFIG_PATH,list(self.clocks.keys()))
-
-    def show_about(self):
-        data = {
-            "version": about.__version__,
-            "package": about.__package__,
-            "program_name": about.__program_name__,
-            "author": about.__author__,
-            "email": about.__email__,
-            "description": about.__description__,
-            "url_source": about.__url_source__,
-            "url_doc": about.__url_doc__,
-            "url_funding": about.__url_funding__,
-            "url_bugs": about.__url_bugs__
-        }
-        
-        base_dir_path = os.path.dirname(os.path.abspath(__file__))
-        logo_path = os.path.join(base_dir_path, 'icons', 'logo.png')
-        
-        show_about_window(data, logo_path)
-
-
-    
-    def exit_app(self):
-        for clock in self.clocks.values():
-            clock.close()
-        QApplication.quit()
+from multiple_desktop_clocks.modules.configure import load_zone_list
+from multiple_desktop_clocks.modules import control
+
+
+def create_desktop_integration(desktop_path='~/.local/share/applications', overwrite=False):
+    from multiple_desktop_clocks.desktop import create_desktop_file, create_desktop_directory, create_desktop_menu
+    create_desktop_directory(overwrite = overwrite)
+    create_desktop_menu(overwrite = overwrite)
+    create_desktop_file(desktop_path, overwrite = overwrite)
+
+def print_stats(tray):
+    # JSON snapshot of the runtime metrics on stdout, then exit
+    import json
+    from multiple_desktop_clocks.modules.metrics import get_metrics
+    print(json.dumps(get_metrics().snapshot(), indent=2))
+    tray.exit_app()
+
+def forward_to_running(import_list, stats_seconds):
+    # The zones and --stats of this launch go to the instance that owns the socket
+    if stats_seconds is not None:
+        return control.main(["stats"])
+    for timezone in import_list:
+        control.main(["add", timezone])
+    print(f"{about.__program_name__} is already running.")
+    return 0
 
 def main():
+    profiler = StartupProfiler("--profile-startup" in sys.argv)
+    profiler.mark("interpreter and program import")
     signal.signal(signal.SIGINT, signal.SIG_DFL)
     
-    
-    create_desktop_directory()    
-    create_desktop_menu()
-    create_desktop_file('~/.local/share/applications')
+    # add/remove/list/move/stats go to the running instance, without Qt
+    if len(sys.argv) > 1 and sys.argv[1] in control.COMMANDS:
+        return control.main(sys.argv[1:])
     
     for n in range(len(sys.argv)):
         if sys.argv[n] == "--autostart":
-            create_desktop_directory(overwrite = True)
-            create_desktop_menu(overwrite = True)
-            create_desktop_file('~/.config/autostart', overwrite=True)
+            create_desktop_integration('~/.config/autostart', overwrite=True)
             return
         if sys.argv[n] == "--applications":
-            create_desktop_directory(overwrite = True)
-            create_desktop_menu(overwrite = True)
-            create_desktop_file('~/.local/share/applications', overwrite=True)
+            create_desktop_integration('~/.local/share/applications', overwrite=True)
             return
     
+    # Clocks of config.json as an i3bar/waybar stream on stdout, without Qt
+    for n in range(len(sys.argv)):
+        if sys.argv[n] == "--status-bar":
+            from multiple_desktop_clocks.modules import statusbar
+            protocol = sys.argv[n + 1] if n + 1 < len(sys.argv) else "i3bar"
+            return statusbar.main(protocol)
+    
+    stats_seconds = None
+    for n in range(len(sys.argv)):
+        if sys.argv[n] == "--stats":
+            stats_seconds = 10.0
+            if n + 1 < len(sys.argv) and sys.argv[n + 1].replace(".", "", 1).isdigit():
+                stats_seconds = float(sys.argv[n + 1])
+    
+    simulate_speed = None
+    for n in range(len(sys.argv)):
+        if sys.argv[n] == "--simulate":
+            # Clocks run SPEED times faster than real time, e.g. to watch a DST change
+            try:
+                simulate_speed = float(sys.argv[n + 1])
+            except (IndexError, ValueError):
+                simulate_speed = None
+            if simulate_speed is None or not 0 < simulate_speed < float("inf"):
+                print("Usage: --simulate SPEED, a number greater than 0 (3600: one hour per second)",
+                      file=sys.stderr)
+                return 2
+
+    import_list = []
+    for n in range(len(sys.argv) - 1):
+        if sys.argv[n] == "--import":
+            try:
+                import_list += load_zone_list(sys.argv[n + 1])
+            except (OSError, ValueError) as e:
+                print(f"--import {sys.argv[n + 1]}: {e}", file=sys.stderr)
+                return 2
+        if sys.argv[n] == "--zones":
+            import_list += [tz.strip() for tz in sys.argv[n + 1].split(",") if tz.strip()]
+    
+    # Only one instance: a second launch must not create duplicate clocks
+    if control.is_running():
+        return forward_to_running(import_list, stats_seconds)
+    
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtGui import QIcon
+    from multiple_desktop_clocks.indicator import ClockIndicator
+    profiler.mark("import PyQt5 and clock modules")
     
     app = QApplication(sys.argv)
     app.setApplicationName(about.__package__) # xprop WM_CLASS # *.desktop -> StartupWMClass  
     app.setQuitOnLastWindowClosed(False)
+    profiler.mark("create QApplication")
 
     # Get base directory for icons
     base_dir_path = os.path.dirname(os.path.abspath(__file__))
@@ -219,9 +104,29 @@ def main():
     
     icon = QIcon(icon_path)
     tray = ClockIndicator(icon)
+    # Two launches at the same moment both pass is_running(): only the one that
+    # gets the socket keeps running
+    if not tray.start_control_server():
+        tray.exit_app()
+        if not control.is_running():
+            return 1
+        return forward_to_running(import_list, stats_seconds)
+    if import_list:
+        tray.import_zones(import_list)
+    if simulate_speed is not None:
+        from multiple_desktop_clocks.modules.timesource import SimulatedTimeSource
+        tray.set_time_source(SimulatedTimeSource(speed=simulate_speed))
+    profiler.mark("create tray and clocks")
+    profiler.watch_first_paint(app)
+    
+    if stats_seconds is not None:
+        QTimer.singleShot(int(stats_seconds * 1000), lambda: print_stats(tray))
+    
+    # Desktop files are not needed to show the clocks
+    QTimer.singleShot(3000, create_desktop_integration)
 
     sys.exit(app.exec_())
     
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
 
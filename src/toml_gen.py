@@ -49,6 +49,9 @@ dependencies = [
     "pytz"
 ]
 
+[project.optional-dependencies]
+planner = ["numpy"]
+
 [project.urls]
 "Bug Reports" = "{__url_bugs__}"
 "Funding" = "{__url_funding__}"
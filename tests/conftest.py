@@ -0,0 +1,9 @@
+import os
+import pathlib
+import sys
+
+# The package is imported from the source tree, as benchmarks/run.py does
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent / "src"))
+
+# Nothing under test needs a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
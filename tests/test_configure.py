@@ -0,0 +1,32 @@
+import json
+
+import pytest
+
+from multiple_desktop_clocks.modules.configure import dump_config, load_zone_list
+
+
+def write(tmp_path, text):
+    path = tmp_path / "zones"
+    path.write_text(text)
+    return str(path)
+
+
+def test_plain_text_with_comments(tmp_path):
+    path = write(tmp_path, "# team\nEurope/Paris   # office\n\nAsia/Tokyo extra\n")
+    assert load_zone_list(path) == ["Europe/Paris", "Asia/Tokyo"]
+
+def test_json_list(tmp_path):
+    assert load_zone_list(write(tmp_path, json.dumps(["UTC", "Europe/Paris"]))) == ["UTC", "Europe/Paris"]
+
+def test_config_file(tmp_path):
+    path = write(tmp_path, dump_config({"UTC": {"x": 0, "y": 0}, "Asia/Tokyo": {"x": 1, "y": 1}}))
+    assert load_zone_list(path) == ["UTC", "Asia/Tokyo"]
+
+@pytest.mark.parametrize("data", ['"Europe/Paris"', "[1, 2]", "42", '{"clocks": "UTC"}', "null"])
+def test_other_json_is_rejected(tmp_path, data):
+    with pytest.raises(ValueError):
+        load_zone_list(write(tmp_path, data))
+
+def test_missing_file(tmp_path):
+    with pytest.raises(OSError):
+        load_zone_list(str(tmp_path / "missing"))
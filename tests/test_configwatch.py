@@ -0,0 +1,77 @@
+import json
+
+import pytest
+from PyQt5.QtCore import QCoreApplication
+
+from multiple_desktop_clocks.modules.configure import dump_config
+from multiple_desktop_clocks.modules.configwatch import ConfigWatcher
+from multiple_desktop_clocks.modules.persistence import ConfigWriter
+
+
+@pytest.fixture
+def watched(tmp_path):
+    app = QCoreApplication.instance() or QCoreApplication([])
+    path = str(tmp_path / "config" / "config.json")
+    writer = ConfigWriter(path, delay_ms=0)
+    watcher = ConfigWatcher(path, writer)
+    documents = []
+    watcher.changed.connect(documents.append)
+    yield path, writer, watcher, documents
+    writer.flush()
+    watcher.deleteLater()
+    app.processEvents()
+
+
+def write(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def test_external_edit_is_emitted(watched):
+    path, writer, watcher, documents = watched
+    document = {"clocks": {"UTC": {"x": 10, "y": 20}}, "settings": {}}
+    write(path, json.dumps(document))
+    watcher.reload()
+    assert documents == [document]
+
+def test_own_writes_are_ignored(watched):
+    path, writer, watcher, documents = watched
+    writer.schedule({"UTC": {"x": 10, "y": 20}})
+    writer.flush()
+    watcher.reload()
+    assert documents == []
+
+@pytest.mark.parametrize("text", ['{"clocks": {"UTC": ', "[1, 2]", ""])
+def test_half_written_or_foreign_content_is_skipped(watched, text):
+    path, writer, watcher, documents = watched
+    write(path, text)
+    watcher.reload()
+    assert documents == []
+
+def test_missing_file_is_skipped(watched):
+    path, writer, watcher, documents = watched
+    watcher.reload()
+    assert documents == []
+
+def test_older_own_write_restored_externally_is_emitted(watched):
+    path, writer, watcher, documents = watched
+    first = {"UTC": {"x": 10, "y": 20}}
+    writer.schedule(first)
+    writer.commit()
+    writer.schedule({"UTC": {"x": 30, "y": 40}})
+    writer.flush()
+    write(path, dump_config(first))
+    watcher.reload()
+    assert documents == [{"clocks": first}]
+
+def test_applied_external_content_is_not_written_back(watched, monkeypatch):
+    path, writer, watcher, documents = watched
+    clocks, settings = {"UTC": {"x": 10, "y": 20}}, {"snap": True}
+    write(path, dump_config(clocks, settings))
+    watcher.reload()
+    writes = []
+    with monkeypatch.context() as m:
+        m.setattr(writer.queue, "put", writes.append)
+        writer.schedule(clocks, settings)
+        writer.commit()
+    assert writes == []
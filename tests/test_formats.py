@@ -0,0 +1,79 @@
+import pytest
+
+from multiple_desktop_clocks.modules.formats import (DEFAULT_FORMAT, MAX_PRECISION, PRESETS,
+                                                      FormatError, Template, compile_format)
+
+HOUR = 3600
+DAY = 86400
+
+
+def test_fields_literals_and_tail():
+    template = Template("%H:%M:%S %L", "Paris")
+    assert template.render(HOUR + 61) == "01:01:01"
+    assert template.tail == " Paris"
+    assert template.has_seconds and template.resolution == 1
+
+
+def test_literal_percent_and_label_in_the_middle():
+    template = Template("%L: 100%% at %H", "Tokyo")
+    assert template.render(13 * HOUR) == "Tokyo: 100% at 13"
+    assert template.tail == ""
+
+
+def test_minute_format_ticks_once_a_minute():
+    template = Template("%H:%M", "")
+    assert not template.has_seconds
+    assert template.resolution == 60
+    assert template.next_change(HOUR + 30) == HOUR + 60
+
+
+def test_rollover_updates_every_field():
+    template = Template("%H:%M:%S", "")
+    assert template.render(HOUR - 1) == "00:59:59"
+    assert template.render(HOUR) == "01:00:00"
+    assert template.render(DAY - 1) == "23:59:59"
+    assert template.render(DAY) == "00:00:00"
+
+
+def test_twelve_hour_clock():
+    template = Template("%I:%M %p", "")
+    assert template.render(0) == "12:00 AM"
+    assert template.render(12 * HOUR) == "12:00 PM"
+    assert template.render(13 * HOUR + 5 * 60) == "01:05 PM"
+
+
+def test_date_fields_follow_the_day():
+    template = Template("%Y-%m-%d %a", "")
+    assert template.render(0) == "1970-01-01 Thu"
+    assert template.render(DAY * 366) == "1971-01-02 Sat"
+
+
+def test_offset_fields():
+    template = Template("%Z %z", "")
+    assert template.render(0, 19800, "IST") == "IST +05:30"
+    assert template.render(0, -3 * HOUR - 1800, "NDT") == "NDT -03:30"
+
+
+def test_fraction_digits_and_precision():
+    template = Template("%S.%f", "")
+    assert template.subsecond and template.max_precision == MAX_PRECISION
+    assert template.render(5, fraction=0.256) == "05.256"
+    template.set_precision(1)
+    assert template.render(5, fraction=0.256) == "05.200"
+    assert Template("%S.%2f", "").render(5, fraction=0.256) == "05.25"
+
+
+@pytest.mark.parametrize("spec", ["%H:%Q", "%k", "%0f", "%4f"])
+def test_bad_directives_raise(spec):
+    with pytest.raises(FormatError):
+        Template(spec, "")
+
+
+def test_format_error_is_a_value_error():
+    assert issubclass(FormatError, ValueError)
+
+
+def test_compile_format_presets_and_default():
+    assert compile_format(None, "x").spec == DEFAULT_FORMAT
+    assert compile_format("12h", "x").spec == PRESETS["12h"]
+    assert compile_format("%H", "x").spec == "%H"
@@ -0,0 +1,76 @@
+from multiple_desktop_clocks.modules.layout import resolve_position, screen_position, shelf_pack
+
+# Primary first, as screen_list() returns them
+SCREENS = [("HDMI-1", (0, 0, 1920, 1080)), ("DP-1", (1920, 0, 1280, 1024))]
+W, H = 200, 80
+
+
+def overlaps(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+def inside(rect, screen):
+    x, y, w, h = rect
+    sx, sy, sw, sh = screen
+    return sx <= x and sy <= y and x + w <= sx + sw and y + h <= sy + sh
+
+
+def test_screen_position_is_relative_to_the_screen():
+    assert screen_position(960, 540, SCREENS) == ("HDMI-1", 0.5, 0.5)
+    assert screen_position(1920 + 320, 256, SCREENS) == ("DP-1", 0.25, 0.25)
+    assert screen_position(-5, 0, SCREENS) is None
+    assert screen_position(1920, 1024, SCREENS) is None   # below DP-1
+
+def test_anchor_wins_over_x_and_y():
+    anchor = ("DP-1", 0.5, 0.5)
+    assert resolve_position(anchor, 10, 10, W, H, SCREENS) == (1920 + 640, 512)
+
+def test_anchor_round_trips_through_screen_position():
+    anchor = screen_position(2500, 300, SCREENS)
+    assert resolve_position(anchor, 0, 0, W, H, SCREENS) == (2500, 300)
+
+def test_anchor_near_the_edge_is_pulled_inside():
+    anchor = ("DP-1", 0.99, 0.99)
+    assert resolve_position(anchor, 0, 0, W, H, SCREENS) == (1920 + 1280 - W, 1024 - H)
+
+def test_missing_screen_keeps_x_and_y_on_another_screen():
+    anchor = ("VGA-1", 0.5, 0.5)
+    assert resolve_position(anchor, 2500, 100, W, H, SCREENS) == (2500, 100)
+    assert resolve_position(anchor, 100, 100, W, H, SCREENS) == (100, 100)
+
+def test_off_screen_goes_to_the_primary_screen():
+    assert resolve_position(None, 5000, 5000, W, H, SCREENS) == (1920 - W, 1080 - H)
+    assert resolve_position(None, -300, 20, W, H, SCREENS) == (0, 20)
+
+def test_anchor_follows_a_moved_screen():
+    # The same monitor now left of the primary one
+    moved = [("HDMI-1", (0, 0, 1920, 1080)), ("DP-1", (-1280, 0, 1280, 1024))]
+    assert resolve_position(("DP-1", 0.5, 0.5), 2500, 300, W, H, moved) == (-640, 512)
+
+def test_without_screens_nothing_moves():
+    assert resolve_position(("DP-1", 0.5, 0.5), 12, 34, W, H, []) == (12, 34)
+
+
+def test_shelf_pack_fills_shelves_left_to_right():
+    positions = shelf_pack([(100, 50)] * 3, [("A", (0, 0, 1000, 1000))], margin=10)
+    assert positions == [(10, 10), (120, 10), (230, 10)]
+
+def test_shelf_pack_tallest_first_and_new_shelf_below():
+    sizes = [(400, 40), (400, 80), (400, 60)]
+    positions = shelf_pack(sizes, [("A", (0, 0, 900, 1000))], margin=10)
+    assert positions[1] == (10, 10)      # tallest
+    assert positions[2] == (420, 10)
+    assert positions[0] == (10, 100)     # below the 80 px shelf
+
+def test_shelf_pack_spills_to_the_next_screen():
+    screens = [("A", (0, 0, 500, 200)), ("B", (500, 0, 500, 200))]
+    sizes = [(200, 80)] * 6
+    positions = shelf_pack(sizes, screens, margin=10)
+    rects = [(x, y, w, h) for (x, y), (w, h) in zip(positions, sizes)]
+    assert sum(inside(r, screens[0][1]) for r in rects) == 4
+    assert sum(inside(r, screens[1][1]) for r in rects) == 2
+    assert not any(overlaps(a, b) for i, a in enumerate(rects) for b in rects[i + 1:])
+
+def test_shelf_pack_without_screens():
+    assert shelf_pack([(10, 10)], []) == [None]
@@ -0,0 +1,61 @@
+from PyQt5.QtCore import QPoint, QSize
+
+from multiple_desktop_clocks.modules.snapping import SnapIndex
+
+SIZE = QSize(200, 80)
+
+
+def index(*rects, screens=()):
+    snap = SnapIndex(distance=12, cell=256)
+    for key, rect in enumerate(rects):
+        snap.insert(key, rect)
+    snap.screens = list(screens)
+    return snap
+
+
+def test_far_from_everything_nothing_snaps():
+    snap = index((1000, 1000, 200, 80))
+    assert snap.snap(QPoint(300, 300), SIZE) == QPoint(300, 300)
+
+def test_right_edge_snaps_to_left_edge_of_a_neighbour():
+    snap = index((500, 100, 200, 80))
+    # 5 px gap: the moving clock ends where the other starts
+    assert snap.snap(QPoint(295, 103), SIZE) == QPoint(300, 100)
+
+def test_left_edge_snaps_to_right_edge_of_a_neighbour():
+    snap = index((100, 100, 200, 80))
+    assert snap.snap(QPoint(308, 130), SIZE) == QPoint(300, 130)
+
+def test_top_snaps_below_a_neighbour():
+    snap = index((100, 100, 200, 80))
+    assert snap.snap(QPoint(100, 190), SIZE) == QPoint(100, 180)
+
+def test_nearest_edge_wins():
+    snap = index((500, 100, 200, 80), (110, 190, 200, 80))
+    # Abutting the first needs 4 px, lining up with the right edge (310) of the second 6
+    assert snap.snap(QPoint(304, 140), SIZE).x() == 300
+
+def test_only_clocks_near_the_moving_one_count():
+    # Lined up, but far below: not a candidate
+    snap = index((500, 600, 200, 80))
+    assert snap.snap(QPoint(295, 100), SIZE) == QPoint(295, 100)
+
+def test_just_outside_the_distance():
+    snap = index((500, 100, 200, 80))
+    assert snap.snap(QPoint(287, 100), SIZE) == QPoint(287, 100)
+
+def test_screen_edges():
+    snap = index(screens=[(0, 0, 1920, 1080)])
+    assert snap.snap(QPoint(7, 1080 - 80 - 9), SIZE) == QPoint(0, 1000)
+
+def test_near_only_looks_at_cells_around_the_rect():
+    snap = index((100, 100, 200, 80), (5000, 5000, 200, 80))
+    assert snap.near((150, 150, 10, 10)) == [(100, 100, 200, 80)]
+
+def test_insert_moves_and_remove_forgets():
+    snap = index((100, 100, 200, 80))
+    snap.insert(0, (3000, 3000, 200, 80))
+    assert snap.near((100, 100, 10, 10)) == []
+    snap.remove(0)
+    assert snap.grid == {} and snap.rects == {}
+    snap.remove(0)   # twice is fine
@@ -0,0 +1,23 @@
+import io
+import json
+
+from multiple_desktop_clocks.modules.configure import save_config
+from multiple_desktop_clocks.modules.statusbar import StatusBar
+
+
+def test_unknown_zone_keeps_the_other_clocks(tmp_path, capsys):
+    path = str(tmp_path / "config.json")
+    save_config(path, {"Mars/Olympus": {"x": 0, "y": 0}, "UTC": {"x": 0, "y": 0, "format": "%H:%M"}})
+    bar = StatusBar("waybar", path, out=io.StringIO())
+    bar.load()
+    assert [clock.timezone for clock in bar.clocks] == ["UTC"]
+    assert "Unknown time zone: Mars/Olympus" in capsys.readouterr().err
+
+def test_i3bar_line_has_one_block_per_clock(tmp_path):
+    path = str(tmp_path / "config.json")
+    save_config(path, {"UTC": {"x": 0, "y": 0, "format": "%H:%M:%S"}})
+    bar = StatusBar("i3bar", path, out=io.StringIO())
+    bar.load()
+    blocks = json.loads(bar.line(3723).rstrip(","))
+    assert blocks == [{"name": "clock", "instance": "UTC", "full_text": "01:02:03"}]
+    assert bar.line(3723) is None   # nothing changed
@@ -0,0 +1,134 @@
+import os
+import struct
+from bisect import bisect_right
+from datetime import date, datetime, timezone
+
+import pytest
+
+from multiple_desktop_clocks.modules.tzbackend import (EPOCH_ORDINAL, LAST_YEAR, ZONEINFO_PATHS,
+                                                        parse_posix_tz, read_tzif, rule_day)
+
+
+def utc(*args):
+    return int(datetime(*args, tzinfo=timezone.utc).timestamp())
+
+def offset_at(table, t):
+    transitions, offsets, abbrs = table
+    i = bisect_right(transitions, t) - 1
+    return offsets[i], abbrs[i]
+
+def tzif_block(times, indices, types, chars, time_size):
+    # Header counts: isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt
+    data = struct.pack(">6l", 0, 0, 0, len(times), len(types), len(chars))
+    data += struct.pack(">%d%s" % (len(times), "q" if time_size == 8 else "l"), *times)
+    data += bytes(indices)
+    for utoff, isdst, abbrind in types:
+        data += struct.pack(">lBB", utoff, isdst, abbrind)
+    return data + chars
+
+def tzif(times, indices, types, chars, version=b"2", footer=""):
+    v1 = b"TZif" + version + bytes(15) + tzif_block(times, indices, types, chars, 4)
+    if version == b"\0":
+        return v1
+    v2 = b"TZif" + version + bytes(15) + tzif_block(times, indices, types, chars, 8)
+    return v1 + v2 + b"\n" + footer.encode("ascii") + b"\n"
+
+CET_TYPES = [(3600, 0, 0), (7200, 1, 4)]
+CET_CHARS = b"CET\0CEST\0"
+
+
+# ======== POSIX TZ strings ========
+
+def test_parse_european_rule():
+    assert parse_posix_tz("CET-1CEST,M3.5.0,M10.5.0/3") == (
+        "CET", 3600, "CEST", 7200, ("M3.5.0", 7200), ("M10.5.0", 10800))
+
+def test_parse_without_dst():
+    assert parse_posix_tz("JST-9") == ("JST", 9 * 3600, None, None, None, None)
+    assert parse_posix_tz("<+0530>-5:30")[:2] == ("+0530", 19800)
+
+def test_parse_defaults_to_us_rules():
+    assert parse_posix_tz("EST5EDT") == (
+        "EST", -5 * 3600, "EDT", -4 * 3600, ("M3.2.0", 7200), ("M11.1.0", 7200))
+
+@pytest.mark.parametrize("text", ["", "CET", "1CET", "CET-1CEST,M3.5.0"])
+def test_parse_invalid(text):
+    with pytest.raises(ValueError):
+        parse_posix_tz(text)
+
+def test_rule_days():
+    def day(year, rule):
+        return date.fromordinal(EPOCH_ORDINAL + rule_day(year, rule))
+    assert day(2024, "M3.5.0") == date(2024, 3, 31)    # last Sunday of March
+    assert day(2024, "M3.2.0") == date(2024, 3, 10)    # second Sunday
+    assert day(2026, "M10.5.0") == date(2026, 10, 25)
+    assert day(2024, "J60") == date(2024, 3, 1)        # Jn never counts Feb 29
+    assert day(2023, "J60") == date(2023, 3, 1)
+    assert day(2024, "59") == date(2024, 2, 29)        # n counts from 0, Feb 29 included
+
+
+# ======== TZif files ========
+
+def test_read_version_1():
+    data = tzif([utc(2000, 3, 26, 1), utc(2000, 10, 29, 1)], [1, 0], CET_TYPES, CET_CHARS, version=b"\0")
+    transitions, offsets, abbrs = read_tzif(data)
+    assert transitions == [float("-inf"), utc(2000, 3, 26, 1), utc(2000, 10, 29, 1)]
+    assert offsets == [3600, 7200, 3600]
+    assert abbrs == ["CET", "CEST", "CET"]
+
+def test_read_rejects_other_files():
+    with pytest.raises(ValueError):
+        read_tzif(b"# not a TZif file\n")
+
+def test_footer_rule_is_expanded_around_dst():
+    data = tzif([utc(2000, 3, 26, 1)], [1], CET_TYPES, CET_CHARS, footer="CET-1CEST,M3.5.0,M10.5.0/3")
+    table = read_tzif(data)
+    # Both changes at 01:00 UTC: 02:00 CET forward, 03:00 CEST back
+    start, end = utc(2024, 3, 31, 1), utc(2024, 10, 27, 1)
+    assert offset_at(table, start - 1) == (3600, "CET")
+    assert offset_at(table, start) == (7200, "CEST")
+    assert offset_at(table, end - 1) == (7200, "CEST")
+    assert offset_at(table, end) == (3600, "CET")
+    assert offset_at(table, utc(2000, 10, 29, 1)) == (3600, "CET")   # the first year of the rule
+    assert date.fromordinal(EPOCH_ORDINAL + int(table[0][-1]) // 86400).year == LAST_YEAR
+    assert table[0][1:] == sorted(table[0][1:])
+
+def test_footer_rule_southern_hemisphere():
+    # DST over the new year: the end comes before the start in each year
+    data = tzif([utc(2008, 10, 4, 16)], [1], [(36000, 0, 0), (39600, 1, 5)], b"AEST\0AEDT\0",
+                footer="AEST-10AEDT,M10.1.0,M4.1.0/3")
+    table = read_tzif(data)
+    end, start = utc(2024, 4, 6, 16), utc(2024, 10, 5, 16)
+    assert offset_at(table, end - 1) == (39600, "AEDT")
+    assert offset_at(table, end) == (36000, "AEST")
+    assert offset_at(table, start - 1) == (36000, "AEST")
+    assert offset_at(table, start) == (39600, "AEDT")
+
+def test_footer_without_dst_after_the_last_transition():
+    # A zone that dropped DST: the rule only confirms the last offset
+    data = tzif([utc(2016, 3, 27)], [0], [(10800, 0, 0)], b"+03\0", footer="<+03>-3")
+    transitions, offsets, abbrs = read_tzif(data)
+    assert offsets[-1] == 10800 and abbrs[-1] == "+03"
+    assert len(transitions) == 2
+
+
+def system_zone(name):
+    for root in [os.environ.get("TZDIR")] + list(ZONEINFO_PATHS):
+        if root and os.path.isfile(os.path.join(root, name)):
+            return os.path.join(root, name)
+    pytest.skip("no system tzdata")
+
+@pytest.mark.parametrize("name", ["Europe/Paris", "America/New_York", "Australia/Sydney"])
+def test_system_files_match_zoneinfo(name):
+    zoneinfo = pytest.importorskip("zoneinfo")
+    path = system_zone(name)
+    with open(path, "rb") as f:
+        table = read_tzif(f.read())
+        f.seek(0)
+        zone = zoneinfo.ZoneInfo.from_file(f)
+    for year in (1975, 2000, 2024, 2037, 2070):
+        for month in range(1, 13):
+            for day in (1, 15):
+                t = utc(year, month, day, 12)
+                expected = datetime.fromtimestamp(t, zone)
+                assert offset_at(table, t) == (int(expected.utcoffset().total_seconds()), expected.tzname())
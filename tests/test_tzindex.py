@@ -0,0 +1,86 @@
+import pytest
+
+from multiple_desktop_clocks.modules import tzengine, tzindex
+from multiple_desktop_clocks.modules.timesource import SimulatedTimeSource, SystemTimeSource, set_time_source
+from multiple_desktop_clocks.modules.tzengine import TimezoneEngine
+
+SUMMER = 1_000_000   # Europe/Paris switches to CEST at this instant
+
+ZONES = {
+    "Europe/Paris": ([float("-inf"), SUMMER], [3600, 7200], ["CET", "CEST"]),
+    "Europe/Istanbul": ([float("-inf")], [10800], ["+03"]),
+    "Asia/Kolkata": ([float("-inf")], [19800], ["IST"]),
+    "America/Los_Angeles": ([float("-inf")], [-28800], ["PST"]),
+    "PST8PDT": ([float("-inf")], [-28800], ["PST"]),
+    "Australia/Sydney": ([float("-inf")], [36000], ["AEST"]),
+    "Pacific/Kiritimati": ([float("-inf")], [50400], ["+14"]),
+}
+
+
+class FakeBackend:
+    def names(self):
+        return set(ZONES)
+
+    def transitions(self, name):
+        return ZONES[name]
+
+    def country_names(self):
+        return {}
+
+    def open_resource(self, name):
+        raise OSError(name)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    monkeypatch.setattr(tzengine, "_engine", TimezoneEngine(FakeBackend()))
+    source = SimulatedTimeSource(start=0, speed=0)
+    set_time_source(source)
+    yield source
+    set_time_source(SystemTimeSource())
+
+@pytest.fixture
+def index(clock):
+    return tzindex.TimezoneIndex()
+
+
+def names(entries):
+    return [entry.name for entry in entries]
+
+
+@pytest.mark.parametrize("term, key", [
+    ("+1", "utc+01:00"), ("utc+1", "utc+01:00"), ("gmt-3", "utc-03:00"), ("+0530", "utc+05:30"),
+    ("+5:30", "utc+05:30"), ("utc+10:00", "utc+10:00"), ("+15", None), ("+05:3", None),
+])
+def test_offset_key(term, key):
+    assert tzindex.offset_key(term) == key
+
+def test_abbreviations_are_merged_with_names(index):
+    assert names(index.search("pst")) == ["PST8PDT", "America/Los_Angeles"]
+
+def test_city_prefix_comes_before_abbreviation(index):
+    assert names(index.search("ist")) == ["Europe/Istanbul", "Asia/Kolkata"]
+
+def test_offsets_match_exactly(index):
+    assert names(index.search("utc+1")) == ["Europe/Paris"]
+    assert names(index.search("+10")) == ["Australia/Sydney"]
+
+def test_numeric_abbreviations_are_offsets(index):
+    assert names(index.search("+03")) == ["Europe/Istanbul"]
+    assert names(index.search("+14")) == ["Pacific/Kiritimati"]
+
+def test_keys_follow_transitions(index, clock):
+    assert names(index.search("cet")) == ["Europe/Paris"]
+    assert index.search("cest") == []
+    clock.advance(SUMMER)
+    assert names(index.search("cest")) == ["Europe/Paris"]
+    assert names(index.search("utc+2")) == ["Europe/Paris"]
+
+def test_narrowing_keeps_abbreviation_hits(index):
+    assert names(index.search("p")) == ["Europe/Paris", "PST8PDT", "Pacific/Kiritimati", "America/Los_Angeles"]
+    assert names(index.search("ps")) == ["PST8PDT", "America/Los_Angeles"]
+    assert names(index.search("pst")) == ["PST8PDT", "America/Los_Angeles"]
+
+def test_index_does_not_load_engine_tables(index):
+    index.search("pst")
+    assert tzengine.get_engine().tables == {}
@@ -0,0 +1,51 @@
+import os
+
+import pytest
+from PyQt5.QtCore import QCoreApplication
+
+from multiple_desktop_clocks.modules.tzbackend import ZoneinfoBackend
+from multiple_desktop_clocks.modules.tzengine import TimezoneEngine
+from multiple_desktop_clocks.modules.tzwatch import TzdataWatcher
+
+
+@pytest.fixture
+def tzdir(tmp_path):
+    # Only the names matter here: the files are never parsed
+    for name in ("UTC", "Europe/Paris", "America/New_York"):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"TZif")
+    os.symlink("New_York", tmp_path / "America" / "Eastern")
+    return tmp_path
+
+
+@pytest.fixture
+def watcher(tzdir):
+    app = QCoreApplication.instance() or QCoreApplication([])
+    watcher = TzdataWatcher(TimezoneEngine(ZoneinfoBackend(str(tzdir))))
+    yield watcher
+    watcher.deleteLater()
+    app.processEvents()
+
+
+def test_watches_the_zones_of_the_clocks(watcher, tzdir):
+    watcher.watch(["Europe/Paris"])
+    assert set(watcher.watcher.files()) == {str(tzdir / "Europe" / "Paris")}
+    assert set(watcher.watcher.directories()) == {str(tzdir), str(tzdir / "Europe")}
+
+def test_links_watch_their_target(watcher, tzdir):
+    watcher.watch(["America/Eastern"])
+    assert set(watcher.watcher.files()) == {str(tzdir / "America" / "Eastern"), str(tzdir / "America" / "New_York")}
+
+def test_removed_clocks_are_unwatched(watcher, tzdir):
+    watcher.watch(["Europe/Paris", "America/New_York"])
+    watcher.watch(["America/New_York"])
+    assert set(watcher.watcher.files()) == {str(tzdir / "America" / "New_York")}
+    assert str(tzdir / "Europe") not in watcher.watcher.directories()
+
+def test_replaced_file_is_watched_again(watcher, tzdir):
+    watcher.watch(["UTC"])
+    path = tzdir / "UTC"
+    watcher.watcher.removePath(str(path))   # what an atomic replace does
+    watcher.watch()
+    assert watcher.watcher.files() == [str(path)]